@@ -5,12 +5,25 @@ This is the main CLI application that orchestrates the agent and RAG system
 using a sequential chain approach.
 """
 
+import argparse
+import asyncio
 import os
 import sys
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
-from core.agent import WardrobeAgent
-from core.rag import WardrobeRAG
+from core.prompts import CHAIN_ERROR_MESSAGE, WEATHER_ERROR_MESSAGE
+
+if TYPE_CHECKING:
+    # The agent, RAG and tool modules pull in LangChain, OpenAI and FAISS,
+    # which take seconds to import; they are imported on first use instead
+    # so the banner and help show up immediately
+    from core.agent import WardrobeAgent
+    from core.query_parser import TravelQuery
+    from core.rag import WardrobeRAG
+    from tools.weather_api import WeatherError
 
 # Load environment variables
 load_dotenv()
@@ -43,6 +56,9 @@ EXAMPLES:
   • "I'm going to Miami next weekend, what should I wear?"
   • "Help me pack for San Francisco 10 days from now"
   
+BATCH MODE:
+  python main.py --queries-file trips.txt   (one query per line)
+  
 NOTE: Currently supports US locations only (National Weather Service API)
 
 COMMANDS:
@@ -53,11 +69,84 @@ COMMANDS:
     print(help_text)
 
 
-def run_sequential_chain(query: str, verbose: bool = False) -> str:
+@lru_cache(maxsize=1)
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return one event loop for the whole session so pooled async clients stay valid."""
+    return asyncio.new_event_loop()
+
+
+@lru_cache(maxsize=4)
+def _get_agent(verbose: bool = False) -> "WardrobeAgent":
+    """Build the agent once per verbosity setting and reuse it for every query.
+    
+    The RAG step writes the final answer, so the agent stops as soon as it
+    has the weather forecast instead of spending an LLM call on its own.
+    """
+    from core.agent import WardrobeAgent
+    
+    return WardrobeAgent(verbose=verbose, stop_after_weather=True)
+
+
+@lru_cache(maxsize=1)
+def _get_rag() -> "WardrobeRAG":
+    """Build the RAG system once and reuse it for every query."""
+    from core.rag import WardrobeRAG
+    
+    return WardrobeRAG()
+
+
+def _extract_weather_data(result: Dict[str, Any]) -> Optional[Any]:
+    """Return the weather forecast observation from an agent result, if any."""
+    for action, observation in result.get("intermediate_steps", []):
+        if action.tool == "get_weather_forecast":
+            return observation
+    return None
+
+
+def _weather_error_message(error: "WeatherError") -> str:
+    """Return the response for a forecast the weather service could not provide."""
+    return WEATHER_ERROR_MESSAGE.format(error=error.message)
+
+
+def _print_destination(travel: "TravelQuery"):
+    """Print the destination resolved without the agent."""
+    destination = f"{travel.city}, {travel.state}"
+    if travel.days is not None:
+        travel_date = (datetime.now() + timedelta(days=travel.days)).strftime("%Y-%m-%d")
+        destination += f" on {travel_date}"
+    print(f"📍 Destination: {destination}")
+
+
+async def _aget_weather(query: str, verbose: bool) -> Tuple[Optional[Any], Dict[str, Any]]:
+    """
+    Get the weather forecast for a query (step 1 of the chain).
+    
+    Destinations the query parser can resolve are geocoded locally and the
+    forecast is fetched directly; anything else goes through the agent.
+    
+    Returns:
+        The forecast (or None) and the agent result (empty if not used)
+    """
+    from core.query_parser import parse_travel_query
+    from tools.weather_api import aget_weather_forecast
+    
+    travel = parse_travel_query(query)
+    if travel is not None:
+        _print_destination(travel)
+        weather_data = await aget_weather_forecast(travel.latitude, travel.longitude)
+        return weather_data, {}
+    
+    result = await _get_agent(verbose).aget_detailed_response(query)
+    return _extract_weather_data(result), result
+
+
+async def run_sequential_chain(query: str, verbose: bool = False) -> str:
     """
     Run the sequential chain: Agent (tools) → RAG (recommendations)
     
-    Step 1: Agent retrieves weather data using tools
+    Step 1: Weather data is retrieved, directly when the destination can be
+            parsed from the query and by the agent (using tools) otherwise,
+            while relevant wardrobe knowledge is retrieved concurrently
     Step 2: RAG uses weather data + wardrobe knowledge for final recommendations
     
     Args:
@@ -67,24 +156,40 @@ def run_sequential_chain(query: str, verbose: bool = False) -> str:
     Returns:
         Final wardrobe recommendations
     """
-    print("\n🔍 Analyzing your request...")
+    return "".join([chunk async for chunk in stream_sequential_chain(query, verbose=verbose)])
+
+
+async def stream_sequential_chain(query: str, verbose: bool = False) -> AsyncIterator[str]:
+    """
+    Run the sequential chain, yielding the response as it is generated.
     
-    # Step 1: Use Agent to get weather data
-    agent = WardrobeAgent(verbose=verbose)
+    Recommendations from the RAG step are yielded token by token, so the
+    user can start reading before the completion has finished.
+    
+    Args:
+        query: User's query
+        verbose: Whether to show verbose output
+        
+    Yields:
+        Chunks of the final wardrobe recommendations
+    """
+    print("\n🔍 Analyzing your request...")
     
     try:
-        result = agent.get_detailed_response(query)
+        from tools.weather_api import WeatherError
         
-        # Check for errors
-        if "error" in result:
-            return result["output"]
+        rag = _get_rag()
         
-        # Extract weather data from intermediate steps
-        weather_data = None
-        for action, observation in result.get("intermediate_steps", []):
-            if action.tool == "get_weather_forecast":
-                weather_data = observation
-                break
+        # Step 1: Get weather data, retrieving wardrobe knowledge for the
+        # query at the same time since it does not depend on the weather
+        (weather_data, result), context = await asyncio.gather(
+            _aget_weather(query, verbose),
+            rag.aretrieve_context(query)
+        )
+        
+        if isinstance(weather_data, WeatherError):
+            yield _weather_error_message(weather_data)
+            return
         
         # If we have weather data, use RAG for enhanced recommendations
         if weather_data:
@@ -92,17 +197,115 @@ def run_sequential_chain(query: str, verbose: bool = False) -> str:
             print("📚 Consulting wardrobe knowledge base...")
             
             # Step 2: Use RAG to generate recommendations
-            rag = WardrobeRAG()
-            
-            recommendations = rag.get_recommendations(query, weather_data)
-            
-            return recommendations
+            async for chunk in rag.astream_recommendations(query, weather_data, context=context):
+                yield chunk
         else:
             # No weather data, return agent's response
-            return result.get("output", "I couldn't process that request.")
+            yield result.get("output", "I couldn't process that request.")
             
     except Exception as e:
-        return f"An error occurred: {str(e)}\n\nPlease try rephrasing your request with specific location and dates."
+        yield CHAIN_ERROR_MESSAGE.format(error=e)
+
+
+async def print_stream(chunks: AsyncIterator[str]):
+    """Print response chunks as they arrive."""
+    started = False
+    async for chunk in chunks:
+        if not started:
+            # Separate the response from the progress messages
+            sys.stdout.write("\n")
+            started = True
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    print()
+
+
+def run_sequential_chain_batch(
+    queries: List[str],
+    verbose: bool = False,
+    max_concurrency: int = 8
+) -> List[str]:
+    """
+    Run the sequential chain for several queries at once.
+    
+    The agent and RAG steps each process all queries as one batch with up to
+    max_concurrency requests in flight, instead of one round-trip at a time.
+    
+    Args:
+        queries: User queries
+        verbose: Whether to show verbose output
+        max_concurrency: Maximum number of concurrent LLM requests per step
+        
+    Returns:
+        Final wardrobe recommendations, in the same order as queries
+    """
+    from core.query_parser import parse_travel_query
+    from tools.weather_api import WeatherError, aget_weather_forecast
+    
+    print(f"\n🔍 Analyzing {len(queries)} requests...")
+    
+    # Step 1: Get weather data for every query, directly for destinations the
+    # parser resolves and through the agent for the rest
+    travels = [parse_travel_query(query) for query in queries]
+    agent_queries = [query for query, travel in zip(queries, travels) if travel is None]
+    
+    async def fetch_weather():
+        direct = asyncio.gather(
+            *(
+                aget_weather_forecast(travel.latitude, travel.longitude)
+                for travel in travels
+                if travel is not None
+            ),
+            return_exceptions=True
+        )
+        if not agent_queries:
+            # Every destination was parsed, so the agent is not needed
+            return await direct, []
+        via_agent = _get_agent(verbose).aget_detailed_responses(
+            agent_queries, max_concurrency=max_concurrency
+        )
+        return await asyncio.gather(direct, via_agent)
+    
+    direct_results, agent_results = _get_event_loop().run_until_complete(fetch_weather())
+    direct_results, agent_results = iter(direct_results), iter(agent_results)
+    
+    responses: List[str] = []
+    pending = []
+    for index, (query, travel) in enumerate(zip(queries, travels)):
+        outcome = next(direct_results) if travel is not None else next(agent_results)
+        if isinstance(outcome, Exception):
+            responses.append(CHAIN_ERROR_MESSAGE.format(error=outcome))
+            continue
+        
+        if travel is not None:
+            result, weather_data = {}, outcome
+        else:
+            result, weather_data = outcome, _extract_weather_data(outcome)
+        
+        if isinstance(weather_data, WeatherError):
+            responses.append(_weather_error_message(weather_data))
+            continue
+        
+        if weather_data:
+            pending.append((index, query, weather_data))
+        responses.append(result.get("output", "I couldn't process that request."))
+    
+    # Step 2: Use RAG to generate recommendations for queries with weather data
+    if pending:
+        print("🌤️  Weather data retrieved successfully")
+        print("📚 Consulting wardrobe knowledge base...")
+        
+        recommendations = _get_rag().get_recommendations_batch(
+            [query for _, query, _ in pending],
+            [weather_data for _, _, weather_data in pending],
+            max_concurrency=max_concurrency
+        )
+        for (index, _, _), recommendation in zip(pending, recommendations):
+            if isinstance(recommendation, Exception):
+                recommendation = CHAIN_ERROR_MESSAGE.format(error=recommendation)
+            responses[index] = recommendation
+    
+    return responses
 
 
 def interactive_mode():
@@ -130,8 +333,9 @@ def interactive_mode():
             
             # Process the query
             print("\n🤖 TempusVestis:")
-            response = run_sequential_chain(user_input, verbose=False)
-            print("\n" + response)
+            _get_event_loop().run_until_complete(
+                print_stream(stream_sequential_chain(user_input, verbose=False))
+            )
             
         except KeyboardInterrupt:
             print("\n\n👋 Thanks for using TempusVestis! Safe travels!")
@@ -147,22 +351,82 @@ def single_query_mode(query: str):
     print(f"\n💬 Query: {query}")
     print("\n🤖 TempusVestis:")
     
-    response = run_sequential_chain(query, verbose=False)
-    print("\n" + response)
+    _get_event_loop().run_until_complete(
+        print_stream(stream_sequential_chain(query, verbose=False))
+    )
+
+
+def batch_query_mode(queries_file: str):
+    """Run every query in a file (one per line) as a batch and exit."""
+    print_banner()
+    
+    try:
+        with open(queries_file, 'r') as f:
+            queries = [line.strip() for line in f if line.strip()]
+    except (OSError, UnicodeDecodeError) as e:
+        reason = e.strerror if isinstance(e, OSError) else "not a text file"
+        print(f"\n❌ ERROR: Could not read queries file {queries_file}: {reason}")
+        sys.exit(1)
+    
+    if not queries:
+        print(f"\n❌ No queries found in {queries_file}")
+        return
+    
+    responses = run_sequential_chain_batch(queries, verbose=False)
+    for query, response in zip(queries, responses):
+        print("\n" + "="*60)
+        print(f"\n💬 Query: {query}")
+        print("\n🤖 TempusVestis:")
+        print("\n" + response)
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """Argument parser that reports usage errors like the rest of the CLI."""
+    
+    def error(self, message: str):
+        print(f"❌ ERROR: {message}")
+        self.print_usage()
+        sys.exit(2)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command-line arguments."""
+    parser = _ArgumentParser(
+        description="TempusVestis - AI-Powered Wardrobe Consultant"
+    )
+    parser.add_argument(
+        "query",
+        nargs="*",
+        help="travel query to answer (starts interactive mode if omitted)"
+    )
+    parser.add_argument(
+        "--queries-file",
+        metavar="PATH",
+        help="file with one query per line to answer as a batch"
+    )
+    args = parser.parse_args(argv)
+    
+    if args.queries_file is not None and args.query:
+        parser.error("--queries-file cannot be combined with a query; put every query in the file")
+    
+    return args
 
 
 def main():
     """Main entry point for the application."""
+    args = parse_args()
+    
     # Check for API key
     if not os.getenv("OPENAI_API_KEY"):
         print("❌ ERROR: OPENAI_API_KEY not found in environment variables.")
         print("Please create a .env file with your OpenAI API key.")
         sys.exit(1)
     
-    # Check if a query was provided as command-line argument
-    if len(sys.argv) > 1:
-        query = " ".join(sys.argv[1:])
-        single_query_mode(query)
+    # Check if a queries file or a query was provided as command-line argument
+    if args.queries_file is not None:
+        batch_query_mode(args.queries_file)
+    elif args.query:
+        single_query_mode(" ".join(args.query))
     else:
         interactive_mode()
 
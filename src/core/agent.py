@@ -5,25 +5,29 @@ This module creates a LangChain Agent Executor that dynamically selects
 and uses tools to provide weather-based wardrobe recommendations.
 """
 
+import asyncio
 import os
-from typing import Dict, Any, Optional
+from contextlib import aclosing, closing
+from typing import Dict, Any, List, Optional, Union
 from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor, create_openai_functions_agent
+from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 from tools.date_ops import get_current_date, calculate_future_date
-from tools.weather_api import get_weather_forecast
+from tools.geocode import geocode_us_city
+from tools.weather_api import WeatherError, get_weather_forecast
+from core.http_clients import get_http_client, get_async_http_client
 from core.prompts import (
-    WARDROBE_CONSULTANT_SYSTEM_PROMPT,
-    CLARIFICATION_PROMPT,
-    WEATHER_ERROR_PROMPT
+    WARDROBE_CONSULTANT_PROMPT_CACHE_KEY,
+    WARDROBE_CONSULTANT_SYSTEM_PROMPT
 )
 
 
 def create_wardrobe_agent(
     model_name: str = "gpt-4o-mini",
     temperature: float = 0.7,
-    verbose: bool = True
+    verbose: bool = True,
+    stop_after_weather: bool = False
 ) -> AgentExecutor:
     """
     Create a wardrobe consultant agent with dynamic tool selection.
@@ -32,22 +36,40 @@ def create_wardrobe_agent(
         model_name: The OpenAI model to use
         temperature: The temperature for LLM responses
         verbose: Whether to show verbose output
+        stop_after_weather: Whether to finish as soon as the weather forecast is
+            retrieved, returning it as the output instead of asking the LLM to
+            write a final answer (for callers that generate their own answer).
+            The executor only honours this when the forecast is the only tool
+            call of its turn; WardrobeAgent also covers forecasts requested
+            alongside other tools
         
     Returns:
         An AgentExecutor configured with the wardrobe consultant tools
     """
-    # Initialize the LLM
+    # Initialize the LLM, letting it request independent tools in one turn and
+    # routing requests to the server that has the system prompt cached
     llm = ChatOpenAI(
         model=model_name,
         temperature=temperature,
-        api_key=os.getenv("OPENAI_API_KEY")
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        model_kwargs={
+            "parallel_tool_calls": True,
+            "prompt_cache_key": WARDROBE_CONSULTANT_PROMPT_CACHE_KEY,
+        }
     )
     
     # Define the tools available to the agent
+    weather_tool = get_weather_forecast
+    if stop_after_weather:
+        weather_tool = get_weather_forecast.model_copy(update={"return_direct": True})
+    
     tools = [
         get_current_date,
         calculate_future_date,
-        get_weather_forecast,
+        geocode_us_city,
+        weather_tool,
     ]
     
     # Create the prompt template
@@ -57,8 +79,9 @@ def create_wardrobe_agent(
         MessagesPlaceholder(variable_name="agent_scratchpad"),
     ])
     
-    # Create the agent
-    agent = create_openai_functions_agent(llm, tools, prompt)
+    # Create the agent (tool calls from a single turn run concurrently
+    # when the executor is driven with ainvoke)
+    agent = create_openai_tools_agent(llm, tools, prompt)
     
     # Create and return the agent executor
     agent_executor = AgentExecutor(
@@ -94,57 +117,43 @@ def run_agent(
     
     try:
         result = agent.invoke({"input": query})
-        
-        # Check if any errors occurred in tool calls
-        if "intermediate_steps" in result:
-            for action, observation in result["intermediate_steps"]:
-                # Check for error patterns in observations
-                if isinstance(observation, str):
-                    if "error" in observation.lower() or "exception" in observation.lower():
-                        # Inject error handling context
-                        result["has_errors"] = True
-                        
-        return result
-    except KeyError as e:
-        # Handle missing location or ambiguous input
-        if "properties" in str(e) or "forecast" in str(e):
-            return {
-                "output": f"{WEATHER_ERROR_PROMPT}\n\nError details: {str(e)}",
-                "error": str(e),
-                "error_type": "weather_api",
-                "intermediate_steps": []
-            }
+    except Exception as e:
         return {
-            "output": f"{CLARIFICATION_PROMPT}\n\nI need more specific information to help you. Could you provide more details about your destination and travel dates?",
+            "output": f"I encountered an error while processing your request. Please try rephrasing with more specific details about your destination and travel dates.\n\nError: {str(e)}",
             "error": str(e),
-            "error_type": "clarification",
+            "error_type": "general",
             "intermediate_steps": []
         }
-    except Exception as e:
-        error_message = str(e).lower()
-        
-        # Check for specific error types
-        if "location" in error_message or "coordinates" in error_message:
-            return {
-                "output": f"{WEATHER_ERROR_PROMPT}",
-                "error": str(e),
-                "error_type": "location",
-                "intermediate_steps": []
-            }
-        elif "date" in error_message or "time" in error_message:
-            return {
-                "output": f"{CLARIFICATION_PROMPT}\n\nI'm not sure about the dates you mentioned. Could you provide a specific date or number of days from now?",
-                "error": str(e),
-                "error_type": "date",
-                "intermediate_steps": []
-            }
-        else:
-            return {
-                "output": f"I encountered an error while processing your request. Please try rephrasing with more specific details about your destination and travel dates.\n\nError: {str(e)}",
-                "error": str(e),
-                "error_type": "general",
-                "intermediate_steps": []
-            }
+    
+    # Weather lookups NWS cannot serve come back as WeatherError observations
+    for action, observation in result.get("intermediate_steps", []):
+        if isinstance(observation, WeatherError):
+            result["has_errors"] = True
+            result["error_type"] = "weather_api"
+            result["error"] = observation.message
+    
+    return result
+
+
+def _weather_step_result(
+    inputs: Dict[str, Any],
+    intermediate_steps: List[tuple]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the agent result for a run that stops at its weather forecast.
+    
+    Args:
+        inputs: The inputs the agent was run with
+        intermediate_steps: The (action, observation) pairs taken so far
+        
+    Returns:
+        The result with the forecast as its output, or None if no step has
+        retrieved the forecast yet
+    """
+    for action, observation in intermediate_steps:
+        if action.tool == get_weather_forecast.name:
+            return {**inputs, "output": observation, "intermediate_steps": intermediate_steps}
+    return None
 
 
 def get_agent_response(
@@ -176,7 +185,8 @@ class WardrobeAgent:
         self,
         model_name: str = "gpt-4o-mini",
         temperature: float = 0.7,
-        verbose: bool = False
+        verbose: bool = False,
+        stop_after_weather: bool = False
     ):
         """
         Initialize the wardrobe agent.
@@ -185,13 +195,17 @@ class WardrobeAgent:
             model_name: The OpenAI model to use
             temperature: The temperature for LLM responses
             verbose: Whether to show verbose output
+            stop_after_weather: Whether to finish as soon as the weather
+                forecast is retrieved, skipping the final LLM answer
         """
         self.agent = create_wardrobe_agent(
             model_name=model_name,
             temperature=temperature,
-            verbose=verbose
+            verbose=verbose,
+            stop_after_weather=stop_after_weather
         )
         self.verbose = verbose
+        self.stop_after_weather = stop_after_weather
     
     def ask(self, query: str) -> str:
         """
@@ -216,7 +230,73 @@ class WardrobeAgent:
         Returns:
             A dictionary with the output and intermediate steps
         """
-        return self.agent.invoke({"input": query})
+        if not self.stop_after_weather:
+            return self.agent.invoke({"input": query})
+        
+        # Step through the run so it can end after the turn that fetched the
+        # forecast, even when other tools were called in the same turn
+        inputs = {"input": query}
+        intermediate_steps = []
+        with closing(iter(self.agent.iter(inputs))) as steps:
+            for output in steps:
+                if "intermediate_step" not in output:
+                    return output
+                intermediate_steps.extend(output["intermediate_step"])
+                result = _weather_step_result(inputs, intermediate_steps)
+                if result is not None:
+                    return result
+    
+    async def aget_detailed_response(self, query: str) -> Dict[str, Any]:
+        """
+        Async version of get_detailed_response.
+        
+        Tool calls requested in the same turn are executed concurrently.
+        
+        Args:
+            query: The user's question or request
+            
+        Returns:
+            A dictionary with the output and intermediate steps
+        """
+        if not self.stop_after_weather:
+            return await self.agent.ainvoke({"input": query})
+        
+        inputs = {"input": query}
+        intermediate_steps = []
+        async with aclosing(aiter(self.agent.iter(inputs))) as steps:
+            async for output in steps:
+                if "intermediate_step" not in output:
+                    return output
+                intermediate_steps.extend(output["intermediate_step"])
+                result = _weather_step_result(inputs, intermediate_steps)
+                if result is not None:
+                    return result
+    
+    async def aget_detailed_responses(
+        self,
+        queries: List[str],
+        max_concurrency: int = 8
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Get detailed responses for several queries concurrently.
+        
+        Args:
+            queries: The user's questions or requests
+            max_concurrency: Maximum number of queries processed at once
+            
+        Returns:
+            One result dictionary per query, or the exception it raised
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def respond(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aget_detailed_response(query)
+        
+        return await asyncio.gather(
+            *(respond(query) for query in queries),
+            return_exceptions=True
+        )
     
     def explain_reasoning(self, query: str) -> None:
         """
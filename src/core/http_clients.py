@@ -0,0 +1,41 @@
+"""
+Shared HTTP clients for OpenAI API calls.
+
+The agent, RAG chain and embeddings all talk to the same host, so they share
+one connection pool per sync/async mode instead of each opening their own.
+HTTP/2 lets concurrent requests (parallel tool turns, batched queries) be
+multiplexed over a single connection.
+"""
+
+from functools import lru_cache
+
+import httpx
+
+# Keep idle connections long enough to survive the pause between two
+# interactive queries, so follow-up questions skip the TLS handshake.
+OPENAI_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=32,
+    keepalive_expiry=120.0
+)
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Get the shared synchronous HTTP client for OpenAI requests.
+    
+    Returns:
+        A pooled HTTP/2 client
+    """
+    return httpx.Client(http2=True, limits=OPENAI_HTTP_LIMITS)
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared asynchronous HTTP client for OpenAI requests.
+    
+    Returns:
+        A pooled HTTP/2 client
+    """
+    return httpx.AsyncClient(http2=True, limits=OPENAI_HTTP_LIMITS)
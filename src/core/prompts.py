@@ -4,6 +4,10 @@ System prompts for the TempusVestis AI Wardrobe Consultant.
 This module defines the persona and instructions for the AI agent.
 """
 
+# Routing key for OpenAI prompt caching; bump the version whenever the system
+# prompt changes so requests with the new prefix are cached separately
+WARDROBE_CONSULTANT_PROMPT_CACHE_KEY = "tempus_vestis_sys_v2"
+
 WARDROBE_CONSULTANT_SYSTEM_PROMPT = """You are TempusVestis, an expert AI wardrobe consultant and packing advisor.
 
 Your role is to help users determine what clothing and items to pack for trips based on:
@@ -15,7 +19,9 @@ Your role is to help users determine what clothing and items to pack for trips b
 
 1. **Always use the provided tools** to get accurate information:
    - Use `calculate_future_date` to determine the target date from user input
-   - Use `get_weather_forecast` to retrieve weather data for the location and dates
+   - Use `geocode_us_city` to get the latitude and longitude of the destination;
+     never estimate coordinates yourself
+   - Use `get_weather_forecast` with those coordinates to retrieve weather data for the dates
    
 2. **US Locations Only**: The National Weather Service API only works for US locations. 
    If the user asks about a non-US destination, politely inform them that you can only 
@@ -45,20 +51,14 @@ When providing recommendations, structure your response clearly:
 Remember: You are helpful, knowledgeable, and focused on making travel packing stress-free!
 """
 
-CLARIFICATION_PROMPT = """The information provided is ambiguous or unclear. 
-
-Please ask the user a specific clarifying question to help you provide accurate recommendations.
+# Response shown to the user when NWS cannot provide a forecast for the
+# destination; {error} is the reason the weather service gave
+WEATHER_ERROR_MESSAGE = """I couldn't get a weather forecast for that destination: {error}
 
-Be polite and specific about what information you need.
-"""
+Weather data comes from the National Weather Service, which only covers US locations. Please try a different US city or give more specific location details."""
 
-WEATHER_ERROR_PROMPT = """There was an issue retrieving weather data. This could be because:
-- The location is outside the United States (NWS API only covers US locations)
-- The coordinates provided are invalid
-- The API is temporarily unavailable
-
-Please inform the user of the issue and ask if they'd like to:
-1. Try a different US location
-2. Provide more specific location details
-"""
+# Response shown to the user when answering a query fails unexpectedly;
+# {error} is the exception message
+CHAIN_ERROR_MESSAGE = """An error occurred: {error}
 
+Please try rephrasing your request with specific location and dates."""
@@ -0,0 +1,227 @@
+"""
+Deterministic parsing of travel queries.
+
+This module extracts the destination and travel date from simple requests
+such as "What should I pack for Chicago in 7 days?", so the weather forecast
+can be fetched without an LLM call to pick tools and infer coordinates.
+Anything it cannot resolve unambiguously is left to the agent.
+"""
+
+import re
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+from tools.geocode import find_places, lookup_city, normalize_state
+
+# Longest city name (in words) to look for, e.g. "Salt Lake City"
+MAX_CITY_WORDS = 4
+
+# Words that usually introduce the destination in a travel request
+_DESTINATION_MARKERS = {"to", "for", "in", "at", "visit", "visiting", "near", "around"}
+
+# Capitalized words that may follow a city name without making it part of a
+# longer place name ("New York City", "Chicago Friday")
+_CITY_FOLLOWERS = {
+    "City", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+}
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z.'-]*|,")
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+_AMOUNT = r"(\d+|" + "|".join(_NUMBER_WORDS) + r")"
+_RELATIVE_DATE_PATTERNS = [
+    re.compile(rf"\bin {_AMOUNT} (day|week)s?\b"),
+    re.compile(rf"\b{_AMOUNT} (day|week)s? from (?:now|today)\b"),
+]
+_NAMED_DAYS = [
+    ("day after tomorrow", 2),
+    ("tomorrow", 1),
+    ("today", 0),
+    ("tonight", 0),
+    ("next week", 7),
+]
+
+
+class TravelQuery(NamedTuple):
+    city: str
+    state: Optional[str]
+    latitude: float
+    longitude: float
+    days: Optional[int]
+
+
+def _parse_days(query: str) -> Optional[int]:
+    """
+    Get the number of days from today until the trip, if the query says.
+
+    Args:
+        query: The user's question or request
+
+    Returns:
+        Number of days from today, or None if no supported phrase is found
+    """
+    text = query.lower()
+
+    for pattern in _RELATIVE_DATE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            amount, unit = match.groups()
+            count = int(amount) if amount.isdigit() else _NUMBER_WORDS[amount]
+            return count * 7 if unit == "week" else count
+
+    for phrase, days in _NAMED_DAYS:
+        if re.search(rf"\b{phrase}\b", text):
+            return days
+
+    weekend = re.search(r"\b(this|next) weekend\b", text)
+    if weekend:
+        # Days until the coming Saturday, or the one after it
+        days = (5 - datetime.now().weekday()) % 7
+        return days + 7 if weekend.group(1) == "next" else days
+
+    return None
+
+
+def _is_capitalized(token: str) -> bool:
+    """Check whether a token could be part of a place name ("Salt", "St.")."""
+    return token[0].isupper() and token != "I"
+
+
+def _ends_place_name(tokens: List[str]) -> bool:
+    """
+    Check whether a city name ends where these tokens start.
+
+    A following capitalized word that is not a state (e.g. "Verde" in "Mesa
+    Verde" or "Wild" in "Buffalo Wild Wings") means the place is something
+    longer that merely starts with a city name.
+
+    Args:
+        tokens: Query tokens following the city name
+
+    Returns:
+        False if the name continues into the next token, True otherwise
+    """
+    if not tokens or not _is_capitalized(tokens[0]) or tokens[0] in _CITY_FOLLOWERS:
+        return True
+    return _find_state(tokens) is not None
+
+
+def _find_city(tokens: List[str]) -> Optional[Tuple[str, int]]:
+    """
+    Find the destination city in the query tokens.
+
+    Only capitalized names right after a destination marker ("to", "for",
+    ...) count, and longer names win over shorter ones. If a capitalized
+    phrase after a marker is not a known US city (e.g. "to Paris"), a known
+    city is only the start of a longer name (e.g. "to Mesa Verde"), or
+    several different cities are named, the destination is unclear and
+    nothing is returned.
+
+    Args:
+        tokens: Words and commas from the query
+
+    Returns:
+        The matched city name and the index of the token after it, or None
+    """
+    match = None
+
+    for marker, token in enumerate(tokens[:-1]):
+        start = marker + 1
+        if token.lower() not in _DESTINATION_MARKERS or not _is_capitalized(tokens[start]):
+            continue
+
+        candidate = None
+        for length in range(min(MAX_CITY_WORDS, len(tokens) - start), 0, -1):
+            span = tokens[start:start + length]
+            if "," in span or not all(_is_capitalized(word) for word in span):
+                continue
+
+            name = " ".join(span)
+            if find_places(name):
+                end = start + length
+                if not _ends_place_name(tokens[end:]):
+                    return None
+                candidate = (name, end)
+                break
+
+        if candidate is None:
+            return None
+        if match is not None and find_places(match[0]) != find_places(candidate[0]):
+            return None
+        if match is None:
+            match = candidate
+
+    return match
+
+
+def _find_state(tokens: List[str]) -> Optional[str]:
+    """
+    Find a state name or code directly following a city name.
+
+    Two-letter codes are only accepted in capitals or after a comma, so
+    words like "in" or "me" are not mistaken for Indiana or Maine.
+
+    Args:
+        tokens: Query tokens following the city name
+
+    Returns:
+        The two-letter state code, or None
+    """
+    after_comma = bool(tokens) and tokens[0] == ","
+    if after_comma:
+        tokens = tokens[1:]
+
+    for length in (2, 1):
+        words = tokens[:length]
+        if len(words) < length or "," in words:
+            continue
+
+        text = " ".join(words)
+        is_code = length == 1 and len(text.replace(".", "")) == 2
+        if is_code and not (text.isupper() or after_comma):
+            continue
+
+        state = normalize_state(text)
+        if state is not None:
+            return state
+
+    return None
+
+
+def parse_travel_query(query: str) -> Optional[TravelQuery]:
+    """
+    Extract the destination and travel date from a user query.
+
+    Args:
+        query: The user's question or request
+
+    Returns:
+        The parsed query, or None if the destination is missing, unknown or
+        ambiguous (for example "Portland" or "Washington" without a state,
+        or a query that also names a place outside the gazetteer)
+    """
+    tokens = _TOKEN_PATTERN.findall(query)
+
+    match = _find_city(tokens)
+    if match is None:
+        return None
+
+    city, end = match
+    state = _find_state(tokens[end:])
+
+    coordinates = lookup_city(city, state)
+    if coordinates is None:
+        return None
+
+    if state is None:
+        state = find_places(city)[0].state
+        # A city named like a state in some other state ("Washington" is
+        # DC, but may mean Washington state) needs the state spelled out
+        if normalize_state(city) not in (None, state):
+            return None
+
+    latitude, longitude = coordinates
+    return TravelQuery(city, state, latitude, longitude, _parse_days(query))
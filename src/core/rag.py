@@ -5,18 +5,76 @@ This module implements a vector store and retriever for style/wardrobe advice.
 """
 
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple, Union
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
+from core.http_clients import get_http_client, get_async_http_client
+
+if TYPE_CHECKING:
+    # FAISS and NumPy are imported where they are used, so that importing
+    # this module does not pay for loading them
+    import faiss
+    import numpy as np
+    from langchain_community.vectorstores import FAISS
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_KNOWLEDGE_PATH = os.path.join(BASE_DIR, "data", "wardrobe_rules.txt")
+VECTORSTORE_CACHE_DIR = os.path.join(BASE_DIR, ".cache", "wardrobe_faiss")
+
+# Maximum number of inputs OpenAI accepts in one embeddings request
+EMBEDDINGS_MAX_BATCH_SIZE = 2048
+
+# Embedding size requested from the text-embedding-3 models (which can be
+# shortened from their native 1536 dimensions); used for indexing and queries
+EMBEDDING_DIMENSIONS = 512
+
+# HNSW graph parameters: neighbours per node and candidate list sizes used
+# while building the graph and while searching it
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+
+# IVF-PQ parameters: inverted lists, sub-quantizers (bytes per vector) and
+# bits per code. Product quantization only pays off once there are enough
+# vectors to train it; FAISS recommends at least 39 training points per
+# centroid, and each sub-quantizer has 2 ** PQ_NBITS centroids.
+PQ_NLIST = 64
+PQ_M = 64
+PQ_NBITS = 8
+PQ_NPROBE = 8
+PQ_MIN_TRAINING_VECTORS = 39 * max(PQ_NLIST, 2 ** PQ_NBITS)
+
+# Routing key for OpenAI prompt caching; bump the version whenever the RAG
+# prompt template changes
+RAG_PROMPT_CACHE_KEY = "tempus_vestis_rag_v1"
+
+RAG_PROMPT_TEMPLATE = """You are a wardrobe and packing expert. Use the following wardrobe knowledge to provide specific, actionable recommendations.
+
+Weather Information:
+{weather_info}
+
+Relevant Wardrobe Guidelines:
+{context}
+
+User Query: {question}
+
+Provide a detailed, practical packing list and wardrobe recommendations based on the weather and the wardrobe guidelines. Be specific about clothing items, accessories, and quantities."""
+
+_RAG_PROMPT = ChatPromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
+
 
 def load_wardrobe_knowledge(file_path: str = None) -> List[Document]:
     """
     Load wardrobe rules from the knowledge base file.
     
+    Parsed documents are memoized on the file's path and modification time,
+    so repeated loads only re-read the file after it has been edited.
+    
     Args:
         file_path: Path to the wardrobe rules file
         
@@ -25,9 +83,23 @@ def load_wardrobe_knowledge(file_path: str = None) -> List[Document]:
     """
     if file_path is None:
         # Default to data/wardrobe_rules.txt
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        file_path = os.path.join(base_dir, "data", "wardrobe_rules.txt")
+        file_path = DEFAULT_KNOWLEDGE_PATH
     
+    return list(_parse_wardrobe_knowledge(file_path, os.path.getmtime(file_path)))
+
+
+@lru_cache(maxsize=8)
+def _parse_wardrobe_knowledge(file_path: str, mtime: float) -> Tuple[Document, ...]:
+    """
+    Read and split the knowledge base file into section documents.
+    
+    Args:
+        file_path: Path to the wardrobe rules file
+        mtime: Modification time of the file (part of the cache key)
+        
+    Returns:
+        Tuple of Document objects containing wardrobe knowledge
+    """
     with open(file_path, 'r') as f:
         content = f.read()
     
@@ -40,8 +112,13 @@ def load_wardrobe_knowledge(file_path: str = None) -> List[Document]:
     
     for section in sections:
         if section.strip():
-            # Check if this is a header (all caps or has ====)
-            if section.isupper() or '====' in section:
+            # Check if this is a header: a title underlined with ==== or a
+            # lone all-caps line. Only the first two lines are inspected, so
+            # content paragraphs are not scanned in full.
+            first_line, _, rest = section.partition('\n')
+            if rest.startswith('====') or first_line.startswith('====') or (
+                not rest and first_line.isupper()
+            ):
                 # Save previous section if exists
                 if current_content:
                     doc = Document(
@@ -64,16 +141,74 @@ def load_wardrobe_knowledge(file_path: str = None) -> List[Document]:
         )
         documents.append(doc)
     
-    return documents
+    return tuple(documents)
+
+
+def _create_embeddings(
+    embeddings_model: str,
+    chunk_size: int = EMBEDDINGS_MAX_BATCH_SIZE
+) -> OpenAIEmbeddings:
+    """Create the OpenAI embeddings client used to index and query the store."""
+    return OpenAIEmbeddings(
+        model=embeddings_model,
+        dimensions=EMBEDDING_DIMENSIONS,
+        chunk_size=chunk_size,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client()
+    )
+
+
+def _build_index(vectors: "np.ndarray") -> "faiss.Index":
+    """
+    Create an empty FAISS index suited to the given vectors.
+    
+    Large knowledge bases get an IVF-PQ index trained on the vectors, which
+    compresses each vector to PQ_M bytes. Smaller ones, which cannot train the
+    quantizer, get an HNSW graph over the full vectors.
+    
+    Args:
+        vectors: Matrix of document embeddings, one row per document
+        
+    Returns:
+        An empty (but trained, if needed) FAISS index
+    """
+    import faiss
+    
+    count, dim = vectors.shape
+    
+    if count >= PQ_MIN_TRAINING_VECTORS and dim % PQ_M == 0:
+        quantizer = faiss.IndexFlatL2(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, PQ_NLIST, PQ_M, PQ_NBITS)
+        index.train(vectors)
+        return index
+    
+    index = faiss.IndexHNSWFlat(dim, HNSW_M)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    return index
+
+
+def _configure_search(index: "faiss.Index") -> None:
+    """Set the query-time search parameters for the index type."""
+    import faiss
+    
+    if isinstance(index, faiss.IndexHNSWFlat):
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    elif isinstance(index, faiss.IndexIVFPQ):
+        index.nprobe = PQ_NPROBE
 
 
 def create_wardrobe_vectorstore(
     documents: List[Document] = None,
     embeddings_model: str = "text-embedding-3-small"
-) -> FAISS:
+) -> "FAISS":
     """
     Create a FAISS vector store from wardrobe documents.
     
+    The vectors are stored in an approximate nearest-neighbour index (see
+    _build_index), so search time grows sublinearly with the size of the
+    knowledge base.
+    
     Args:
         documents: List of Document objects (if None, loads default)
         embeddings_model: The OpenAI embeddings model to use
@@ -81,20 +216,85 @@ def create_wardrobe_vectorstore(
     Returns:
         A FAISS vector store
     """
+    import numpy as np
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+    
     if documents is None:
         documents = load_wardrobe_knowledge()
     
-    embeddings = OpenAIEmbeddings(
-        model=embeddings_model,
-        api_key=os.getenv("OPENAI_API_KEY")
+    # Send every document in a single embeddings request when the API allows it
+    embeddings = _create_embeddings(
+        embeddings_model,
+        chunk_size=min(max(len(documents), 1), EMBEDDINGS_MAX_BATCH_SIZE)
     )
     
-    vectorstore = FAISS.from_documents(documents, embeddings)
+    texts = [doc.page_content for doc in documents]
+    vectors = embeddings.embed_documents(texts)
+    
+    index = _build_index(np.asarray(vectors, dtype=np.float32))
+    
+    vectorstore = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={}
+    )
+    vectorstore.add_embeddings(
+        zip(texts, vectors),
+        metadatas=[doc.metadata for doc in documents]
+    )
+    _configure_search(index)
+    return vectorstore
+
+
+def load_wardrobe_vectorstore(
+    cache_dir: str = None,
+    embeddings_model: str = "text-embedding-3-small"
+) -> "FAISS":
+    """
+    Load the FAISS vector store from disk, building and saving it if needed.
+    
+    The index is rebuilt whenever the knowledge base file is newer than the
+    saved index, so edits to the wardrobe rules are picked up automatically.
+    
+    Args:
+        cache_dir: Directory holding the saved index (if None, uses the default)
+        embeddings_model: The OpenAI embeddings model to use
+        
+    Returns:
+        A FAISS vector store
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(VECTORSTORE_CACHE_DIR, f"{embeddings_model}-{EMBEDDING_DIMENSIONS}d-ann")
+    
+    index_path = os.path.join(cache_dir, "index.faiss")
+    if (
+        os.path.exists(index_path)
+        and os.path.getmtime(index_path) >= os.path.getmtime(DEFAULT_KNOWLEDGE_PATH)
+    ):
+        from langchain_community.vectorstores import FAISS
+        
+        vectorstore = FAISS.load_local(
+            cache_dir,
+            _create_embeddings(embeddings_model),
+            allow_dangerous_deserialization=True
+        )
+        _configure_search(vectorstore.index)
+        return vectorstore
+    
+    vectorstore = create_wardrobe_vectorstore(embeddings_model=embeddings_model)
+    vectorstore.save_local(cache_dir)
     return vectorstore
 
 
+def _format_docs(docs: List[Document]) -> str:
+    """Join retrieved documents into the context block of the RAG prompt."""
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
 def create_wardrobe_rag_chain(
-    vectorstore: FAISS = None,
+    vectorstore: "FAISS" = None,
     model_name: str = "gpt-4o-mini",
     temperature: float = 0.7,
     k: int = 4
@@ -103,50 +303,39 @@ def create_wardrobe_rag_chain(
     Create a RAG chain for wardrobe recommendations.
     
     Args:
-        vectorstore: The FAISS vector store (if None, creates default)
+        vectorstore: The FAISS vector store (if None, loads default)
         model_name: The OpenAI model to use
         temperature: The temperature for LLM responses
         k: Number of documents to retrieve
         
     Returns:
-        A runnable RAG chain
+        A runnable RAG chain taking "question" and "weather_info", and
+        optionally a pre-retrieved "context"
     """
     if vectorstore is None:
-        vectorstore = create_wardrobe_vectorstore()
+        vectorstore = load_wardrobe_vectorstore()
     
     retriever = vectorstore.as_retriever(search_kwargs={"k": k})
     
     llm = ChatOpenAI(
         model=model_name,
         temperature=temperature,
-        api_key=os.getenv("OPENAI_API_KEY")
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        model_kwargs={"prompt_cache_key": RAG_PROMPT_CACHE_KEY}
     )
     
-    template = """You are a wardrobe and packing expert. Use the following wardrobe knowledge to provide specific, actionable recommendations.
-
-Weather Information:
-{weather_info}
-
-Relevant Wardrobe Guidelines:
-{context}
-
-User Query: {question}
-
-Provide a detailed, practical packing list and wardrobe recommendations based on the weather and the wardrobe guidelines. Be specific about clothing items, accessories, and quantities."""
-
-    prompt = ChatPromptTemplate.from_template(template)
-    
-    def format_docs(docs):
-        return "\n\n".join(doc.page_content for doc in docs)
-    
     def create_rag_input(input_data):
         """Helper function to create the input for the RAG chain."""
         query = input_data["question"]
         weather_info = input_data["weather_info"]
         
-        # Get relevant documents
-        docs = retriever.invoke(query)
-        context = format_docs(docs)
+        # Get relevant documents, unless the caller already retrieved them
+        context = input_data.get("context")
+        if context is None:
+            docs = retriever.invoke(query)
+            context = _format_docs(docs)
         
         return {
             "context": context,
@@ -156,7 +345,7 @@ Provide a detailed, practical packing list and wardrobe recommendations based on
     
     rag_chain = (
         create_rag_input
-        | prompt
+        | _RAG_PROMPT
         | llm
         | StrOutputParser()
     )
@@ -183,7 +372,9 @@ class WardrobeRAG:
             temperature: The temperature for LLM responses
             k: Number of documents to retrieve
         """
-        self.vectorstore = create_wardrobe_vectorstore()
+        self.k = k
+        self.vectorstore = load_wardrobe_vectorstore()
+        self.retriever = self.vectorstore.as_retriever(search_kwargs={"k": k})
         self.chain = create_wardrobe_rag_chain(
             vectorstore=self.vectorstore,
             model_name=model_name,
@@ -217,6 +408,102 @@ class WardrobeRAG:
         
         return self.chain.invoke(input_data)
     
+    def stream_recommendations(
+        self,
+        query: str,
+        weather_info: Dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Stream wardrobe recommendations as the LLM generates them.
+        
+        Args:
+            query: The user's question or request
+            weather_info: Dictionary containing weather information
+            
+        Yields:
+            Chunks of the recommendation text
+        """
+        input_data = {
+            "question": query,
+            "weather_info": self._format_weather_info(weather_info)
+        }
+        
+        yield from self.chain.stream(input_data)
+    
+    async def aretrieve_context(self, query: str) -> str:
+        """
+        Retrieve the wardrobe guidelines relevant to a query.
+        
+        Running this ahead of time lets retrieval overlap with fetching the
+        weather; pass the result as context to astream_recommendations.
+        
+        Args:
+            query: The user's question or request
+            
+        Returns:
+            The retrieved guidelines, formatted for the RAG prompt
+        """
+        docs = await self.retriever.ainvoke(query)
+        return _format_docs(docs)
+    
+    async def astream_recommendations(
+        self,
+        query: str,
+        weather_info: Dict[str, Any],
+        context: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async version of stream_recommendations.
+        
+        Args:
+            query: The user's question or request
+            weather_info: Dictionary containing weather information
+            context: Guidelines from aretrieve_context (if None, retrieves them)
+            
+        Yields:
+            Chunks of the recommendation text
+        """
+        input_data = {
+            "question": query,
+            "weather_info": self._format_weather_info(weather_info)
+        }
+        if context is not None:
+            input_data["context"] = context
+        
+        async for chunk in self.chain.astream(input_data):
+            yield chunk
+    
+    def get_recommendations_batch(
+        self,
+        queries: List[str],
+        weather_infos: List[Dict[str, Any]],
+        max_concurrency: int = 8
+    ) -> List[Union[str, Exception]]:
+        """
+        Get wardrobe recommendations for several queries concurrently.
+        
+        Args:
+            queries: The user's questions or requests
+            weather_infos: Weather information for each query
+            max_concurrency: Maximum number of concurrent LLM requests
+            
+        Returns:
+            Recommendations for each query, or the exception it raised
+        """
+        inputs = [
+            {
+                "question": query,
+                "weather_info": self._format_weather_info(weather_info)
+            }
+            for query, weather_info in zip(queries, weather_infos)
+        ]
+        
+        return self.chain.batch(
+            inputs,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True
+        )
+    
     def _format_weather_info(self, weather_info: Dict[str, Any]) -> str:
         """
         Format weather information into a readable string.
@@ -231,25 +518,18 @@ class WardrobeRAG:
             return weather_info
         
         # Extract relevant weather data
-        formatted = "Weather Forecast:\n"
-        
-        if "properties" in weather_info:
-            periods = weather_info["properties"].get("periods", [])
-            for period in periods[:7]:  # Show up to 7 periods (roughly a week)
-                name = period.get("name", "Unknown")
-                temp = period.get("temperature", "N/A")
-                unit = period.get("temperatureUnit", "F")
-                forecast = period.get("shortForecast", "N/A")
-                wind = period.get("windSpeed", "N/A")
-                
-                formatted += f"\n{name}:\n"
-                formatted += f"  Temperature: {temp}°{unit}\n"
-                formatted += f"  Conditions: {forecast}\n"
-                formatted += f"  Wind: {wind}\n"
-        else:
-            formatted += str(weather_info)
+        if "properties" not in weather_info:
+            return "Weather Forecast:\n" + str(weather_info)
         
-        return formatted
+        periods = weather_info["properties"].get("periods", [])
+        # Show up to 7 periods (roughly a week)
+        return "Weather Forecast:\n" + "".join([
+            f"\n{period.get('name', 'Unknown')}:\n"
+            f"  Temperature: {period.get('temperature', 'N/A')}°{period.get('temperatureUnit', 'F')}\n"
+            f"  Conditions: {period.get('shortForecast', 'N/A')}\n"
+            f"  Wind: {period.get('windSpeed', 'N/A')}\n"
+            for period in periods[:7]
+        ])
     
     def search_knowledge(self, query: str, k: int = 4) -> List[Document]:
         """
@@ -262,6 +542,7 @@ class WardrobeRAG:
         Returns:
             List of relevant documents
         """
-        retriever = self.vectorstore.as_retriever(search_kwargs={"k": k})
-        return retriever.invoke(query)
+        if k == self.k:
+            return self.retriever.invoke(query)
+        return self.vectorstore.similarity_search(query, k=k)
 
@@ -0,0 +1,131 @@
+import csv
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from langchain_core.tools import tool
+
+# Tab-separated gazetteer using the US Census "Gazetteer Files" column names
+# (USPS, NAME, INTPTLAT, INTPTLONG), so a full Census places file can be
+# dropped in its place.
+GAZETTEER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "us_cities.tsv"
+)
+
+US_STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+    "DC": "District of Columbia", "FL": "Florida", "GA": "Georgia", "HI": "Hawaii",
+    "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
+    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine",
+    "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska",
+    "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico",
+    "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
+    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island",
+    "SC": "South Carolina", "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas",
+    "UT": "Utah", "VT": "Vermont", "VA": "Virginia", "WA": "Washington",
+    "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
+}
+
+_STATE_NAMES = {name.lower(): abbr for abbr, name in US_STATES.items()}
+
+# Census place names carry their legal/statistical area type as a suffix,
+# e.g. "Chicago city" or "Urban Honolulu CDP"
+_LSAD_SUFFIX = re.compile(
+    r"\s+(city and borough|city|town|village|borough|municipality|CDP)(\s+\(balance\))?$"
+)
+
+
+class Place(NamedTuple):
+    state: str
+    latitude: float
+    longitude: float
+
+
+def normalize_city_name(name: str) -> str:
+    """
+    Normalize a city name for lookup (case, "St." abbreviations, punctuation).
+    """
+    name = name.lower().replace(".", " ")
+    name = re.sub(r"\bst\b", "saint", name)
+    return " ".join(name.split())
+
+
+def normalize_state(state: str) -> Optional[str]:
+    """
+    Get the two-letter code for a US state given its code or full name.
+    """
+    state = " ".join(state.replace(".", "").split())
+    if state.upper() in US_STATES:
+        return state.upper()
+    return _STATE_NAMES.get(state.lower())
+
+
+@lru_cache(maxsize=4)
+def _load_gazetteer(path: str) -> Dict[str, Tuple[Place, ...]]:
+    """
+    Load the gazetteer into a mapping from normalized city name to places.
+    """
+    places: Dict[str, List[Place]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f, delimiter="\t"):
+            # Census files pad the last header name with spaces
+            row = {key.strip(): value for key, value in row.items()}
+            name = _LSAD_SUFFIX.sub("", row["NAME"].strip())
+            places.setdefault(normalize_city_name(name), []).append(
+                Place(row["USPS"].strip(), float(row["INTPTLAT"]), float(row["INTPTLONG"]))
+            )
+    return {name: tuple(matches) for name, matches in places.items()}
+
+
+def find_places(city: str, path: str = GAZETTEER_PATH) -> Tuple[Place, ...]:
+    """
+    Get every gazetteer place matching a city name.
+    """
+    return _load_gazetteer(path).get(normalize_city_name(city), ())
+
+
+def lookup_city(city: str, state: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """
+    Get the latitude and longitude of a US city.
+
+    Returns None if the city is unknown, or if it exists in several states and
+    no state was given to tell them apart.
+    """
+    places = find_places(city)
+    if state is not None:
+        code = normalize_state(state)
+        places = tuple(place for place in places if place.state == code)
+
+    if not places or len({place.state for place in places}) > 1:
+        return None
+
+    return places[0].latitude, places[0].longitude
+
+
+@tool
+def geocode_us_city(city: str, state: Optional[str] = None) -> Union[Tuple[float, float], str]:
+    """
+    Get the latitude and longitude of a US city.
+
+    Args:
+        city: The city name, e.g. "Chicago" or "St. Louis".
+        state: The state name or two-letter code. Needed for city names found in
+            several states, such as Portland.
+
+    Returns:
+        The latitude and longitude of the city, or a message saying why it
+        could not be located.
+    """
+    coordinates = lookup_city(city, state)
+    if coordinates is not None:
+        return coordinates
+
+    states = sorted({place.state for place in find_places(city)})
+    if state is None and len(states) > 1:
+        return f"{city} exists in several states ({', '.join(states)}); ask which one is meant."
+    if state is not None:
+        return f"{city}, {state} is not a known US city."
+    return f"{city} is not a known US city."
@@ -1,15 +1,173 @@
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+import httpx
 import requests
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 
 from tools.constants import NWS_BASE_URL
 
-def _get_forecast_url(latitude: float, longitude: float) -> str:
+# The points -> forecast URL mapping is fixed per coordinate, so it is kept
+# for the life of the process and shared by the sync and async code paths.
+_FORECAST_URL_CACHE_SIZE = 1024
+_forecast_url_cache: Dict[Tuple[float, float], str] = {}
+
+# Forecast bodies are kept for as long as NWS says they are fresh
+# (Cache-Control: max-age) and revalidated with their ETag afterwards.
+_FORECAST_CACHE_SIZE = 64
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class _CachedForecast(NamedTuple):
+    expires_at: float
+    etag: Optional[str]
+    body: dict
+
+
+_forecast_cache: Dict[str, _CachedForecast] = {}
+
+
+@dataclass(frozen=True)
+class WeatherError:
+    """
+    A forecast that NWS could not provide, e.g. for a point outside the US.
+
+    Returned instead of raised so callers can branch on it cheaply; its string
+    form is what the agent sees as the tool output.
+    """
+    message: str
+
+    def __str__(self) -> str:
+        return f"Weather error: {self.message}"
+
+
+# The forecast body on success, or the reason there is none
+WeatherResult = Union[dict, WeatherError]
+
+
+def _cache_forecast_url(latitude: float, longitude: float, forecast_url: str) -> str:
+    """
+    Remember the forecast URL for a coordinate, evicting the oldest entry when full.
+    """
+    if len(_forecast_url_cache) >= _FORECAST_URL_CACHE_SIZE:
+        _forecast_url_cache.pop(next(iter(_forecast_url_cache)))
+    _forecast_url_cache[(latitude, longitude)] = forecast_url
+    return forecast_url
+
+
+def _fresh_forecast(forecast_url: str) -> Optional[dict]:
+    """
+    Get the cached forecast body if it is still within its max-age window.
+    """
+    cached = _forecast_cache.get(forecast_url)
+    if cached is not None and cached.expires_at > time.monotonic():
+        return cached.body
+    return None
+
+
+def _revalidation_headers(forecast_url: str) -> Dict[str, str]:
+    """
+    Get the conditional request headers for a stale cached forecast.
+    """
+    cached = _forecast_cache.get(forecast_url)
+    if cached is not None and cached.etag:
+        return {"If-None-Match": cached.etag}
+    return {}
+
+
+def _error_message(data, default: str) -> str:
+    """
+    Get the reason from an NWS error document, or the default if it has none.
+    """
+    if not isinstance(data, dict):
+        return default
+    return data.get("detail") or data.get("title") or default
+
+
+def _store_forecast(forecast_url: str, response) -> WeatherResult:
+    """
+    Get the forecast body from a response, updating the cache from its headers.
+
+    A 304 Not Modified response reuses the cached body. Any other response
+    outside 2xx is an NWS error document (or no JSON at all), which is
+    returned as a WeatherError.
+    """
+    cached = _forecast_cache.get(forecast_url)
+    if cached is not None and response.status_code == 304:
+        body = cached.body
+    elif not 200 <= response.status_code < 300:
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return WeatherError(_error_message(
+            data, f"The forecast request failed with HTTP status {response.status_code}"
+        ))
+    else:
+        body = response.json()
+
+    match = _MAX_AGE_PATTERN.search(response.headers.get("Cache-Control", ""))
+    max_age = int(match.group(1)) if match else 0
+    etag = response.headers.get("ETag") or (cached.etag if cached is not None else None)
+    if max_age or etag:
+        if forecast_url not in _forecast_cache and len(_forecast_cache) >= _FORECAST_CACHE_SIZE:
+            _forecast_cache.pop(next(iter(_forecast_cache)))
+        _forecast_cache[forecast_url] = _CachedForecast(time.monotonic() + max_age, etag, body)
+    return body
+
+
+@lru_cache(maxsize=1)
+def _get_async_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP/2 client shared by all async NWS requests.
+    """
+    return httpx.AsyncClient(http2=True)
+
+
+def _parse_forecast_url(latitude: float, longitude: float, response) -> Union[str, WeatherError]:
+    """
+    Get the forecast URL from a points API response, caching it.
+
+    NWS answers points it does not cover with an error document instead of
+    "properties", which is returned as a WeatherError.
+    """
+    data = response.json()
+    properties = data.get("properties") or {}
+    forecast_url = properties.get("forecast")
+    if forecast_url is None:
+        return WeatherError(_error_message(
+            data, f"No forecast is available for {latitude},{longitude}"
+        ))
+    return _cache_forecast_url(latitude, longitude, forecast_url)
+
+
+def _get_forecast_url(latitude: float, longitude: float) -> Union[str, WeatherError]:
     """
     Get the forecast URL for a given latitude and longitude.
     """
+    cached = _forecast_url_cache.get((latitude, longitude))
+    if cached is not None:
+        return cached
+
     url = f"{NWS_BASE_URL}/points/{latitude},{longitude}"
-    data = requests.get(url).json()
-    return data["properties"]["forecast"]
+    return _parse_forecast_url(latitude, longitude, requests.get(url))
+
+
+async def _aget_forecast_url(latitude: float, longitude: float) -> Union[str, WeatherError]:
+    """
+    Async version of _get_forecast_url.
+    """
+    cached = _forecast_url_cache.get((latitude, longitude))
+    if cached is not None:
+        return cached
+
+    url = f"{NWS_BASE_URL}/points/{latitude},{longitude}"
+    response = await _get_async_client().get(url)
+    return _parse_forecast_url(latitude, longitude, response)
+
 
 def _get_summary(forecast: dict) -> dict:
     """
@@ -17,16 +175,53 @@ def _get_summary(forecast: dict) -> dict:
     """
     return forecast
 
-@tool
-def get_weather_forecast(latitude: float, longitude: float, summarize: bool = True) -> str:
+
+def _get_weather_forecast(latitude: float, longitude: float, summarize: bool = True) -> WeatherResult:
     """
     Get the weather forecast for a given city and date.
     """
     forecast_url = _get_forecast_url(latitude, longitude)
-    response = requests.get(forecast_url)
+    if isinstance(forecast_url, WeatherError):
+        return forecast_url
+
+    forecast = _fresh_forecast(forecast_url)
+    if forecast is None:
+        response = requests.get(forecast_url, headers=_revalidation_headers(forecast_url))
+        forecast = _store_forecast(forecast_url, response)
+        if isinstance(forecast, WeatherError):
+            return forecast
 
     if summarize:
-        return _get_summary(response.json())
-    
-    return response.json()
+        return _get_summary(forecast)
+
+    return forecast
+
+
+async def aget_weather_forecast(latitude: float, longitude: float, summarize: bool = True) -> WeatherResult:
+    """
+    Get the weather forecast for a given city and date.
+    """
+    forecast_url = await _aget_forecast_url(latitude, longitude)
+    if isinstance(forecast_url, WeatherError):
+        return forecast_url
+
+    forecast = _fresh_forecast(forecast_url)
+    if forecast is None:
+        response = await _get_async_client().get(
+            forecast_url, headers=_revalidation_headers(forecast_url)
+        )
+        forecast = _store_forecast(forecast_url, response)
+        if isinstance(forecast, WeatherError):
+            return forecast
+
+    if summarize:
+        return _get_summary(forecast)
+
+    return forecast
+
 
+get_weather_forecast = StructuredTool.from_function(
+    func=_get_weather_forecast,
+    coroutine=aget_weather_forecast,
+    name="get_weather_forecast",
+)
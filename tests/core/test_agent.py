@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from langchain_core.agents import AgentAction
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from core import agent as agent_module
+from core.agent import WardrobeAgent, run_agent
+from tools.weather_api import WeatherError
+
+FORECAST = {"periods": [{"name": "Tonight", "temperature": 55, "temperatureUnit": "F"}]}
+
+
+def tool_call(name, args, call_id):
+    """Build a tool call the way the OpenAI tools agent reads it."""
+    return {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+
+
+@tool("get_weather_forecast")
+def fake_weather_forecast(latitude: float, longitude: float) -> dict:
+    """Get the weather forecast for a location."""
+    return FORECAST
+
+
+@pytest.fixture
+def chat_model(request, monkeypatch):
+    """
+    Replace the agent's LLM with a scripted tools-calling model.
+    
+    The model answers with the messages the test parametrizes this fixture
+    with, in order, and the weather tool returns FORECAST without any HTTP.
+    """
+    model = FakeMessagesListChatModel(responses=request.param)
+    monkeypatch.setattr(agent_module, "ChatOpenAI", lambda **kwargs: model)
+    monkeypatch.setattr(agent_module, "get_weather_forecast", fake_weather_forecast)
+    return model
+
+
+WEATHER_CALL = tool_call("get_weather_forecast", {"latitude": 41.88, "longitude": -87.63}, "call_weather")
+DATE_CALL = tool_call("calculate_future_date", {"days": 7}, "call_date")
+FINAL_ANSWER = AIMessage(content="Pack a light jacket.")
+
+
+class TestStopAfterWeather:
+    """Test suite for WardrobeAgent with stop_after_weather."""
+    
+    @pytest.mark.parametrize("chat_model", [
+        [AIMessage(content="", tool_calls=[WEATHER_CALL]), FINAL_ANSWER],
+        [AIMessage(content="", tool_calls=[DATE_CALL, WEATHER_CALL]), FINAL_ANSWER],
+        [AIMessage(content="", tool_calls=[DATE_CALL]), AIMessage(content="", tool_calls=[WEATHER_CALL]), FINAL_ANSWER],
+    ], ids=["single call", "batched calls", "separate turns"], indirect=True)
+    def test_stops_at_the_forecast(self, chat_model):
+        """Test that no LLM turn follows the one that requested the forecast."""
+        agent = WardrobeAgent(stop_after_weather=True)
+        result = asyncio.run(agent.aget_detailed_response("Chicago in a week"))
+        
+        assert chat_model.i == len(chat_model.responses) - 1
+        assert result["output"] == FORECAST
+        assert "get_weather_forecast" in [action.tool for action, _ in result["intermediate_steps"]]
+    
+    @pytest.mark.parametrize("chat_model", [
+        [AIMessage(content="", tool_calls=[DATE_CALL, WEATHER_CALL]), FINAL_ANSWER],
+    ], indirect=True)
+    def test_keeps_the_other_calls_of_the_turn(self, chat_model):
+        """Test that tools batched with the forecast still show up in the steps."""
+        agent = WardrobeAgent(stop_after_weather=True)
+        result = asyncio.run(agent.aget_detailed_response("Chicago in a week"))
+        
+        tools = [action.tool for action, _ in result["intermediate_steps"]]
+        assert sorted(tools) == ["calculate_future_date", "get_weather_forecast"]
+    
+    @pytest.mark.parametrize("chat_model", [
+        [AIMessage(content="Which city are you visiting?")],
+    ], indirect=True)
+    def test_returns_the_answer_without_a_forecast(self, chat_model):
+        """Test that a run that never asks for the weather ends normally."""
+        agent = WardrobeAgent(stop_after_weather=True)
+        result = asyncio.run(agent.aget_detailed_response("Somewhere nice"))
+        
+        assert result["output"] == "Which city are you visiting?"
+        assert result["intermediate_steps"] == []
+    
+    @pytest.mark.parametrize("chat_model", [
+        [AIMessage(content="", tool_calls=[DATE_CALL, WEATHER_CALL]), FINAL_ANSWER],
+    ], indirect=True)
+    def test_runs_to_the_final_answer_without_the_flag(self, chat_model):
+        """Test that the agent writes its own answer when not asked to stop."""
+        agent = WardrobeAgent()
+        result = asyncio.run(agent.aget_detailed_response("Chicago in a week"))
+        
+        assert result["output"] == "Pack a light jacket."
+    
+    @pytest.mark.parametrize("chat_model", [
+        [AIMessage(content="", tool_calls=[DATE_CALL, WEATHER_CALL]), FINAL_ANSWER],
+    ], indirect=True)
+    def test_sync_response_stops_at_the_forecast(self, chat_model):
+        """Test that get_detailed_response also stops after a batched forecast."""
+        agent = WardrobeAgent(stop_after_weather=True)
+        result = agent.get_detailed_response("Chicago in a week")
+        
+        assert chat_model.i == 1
+        assert result["output"] == FORECAST
+
+
+def scripted_agent(intermediate_steps):
+    """Build a stand-in executor whose invoke returns the given steps."""
+    return SimpleNamespace(invoke=lambda inputs: {
+        "input": inputs["input"],
+        "output": "done",
+        "intermediate_steps": intermediate_steps,
+    })
+
+
+class TestRunAgent:
+    """Test suite for run_agent function."""
+    
+    def test_flags_weather_errors(self):
+        """Test that a WeatherError observation marks the result as a weather API error."""
+        action = AgentAction("get_weather_forecast", {"latitude": 48.85, "longitude": 2.35}, "")
+        error = WeatherError("Location not supported by NWS API")
+        
+        result = run_agent("Paris next week", agent=scripted_agent([(action, error)]))
+        
+        assert result["has_errors"] is True
+        assert result["error_type"] == "weather_api"
+        assert result["error"] == "Location not supported by NWS API"
+        assert result["output"] == "done"
+    
+    def test_leaves_successful_forecasts_unflagged(self):
+        """Test that a forecast observation does not add error keys."""
+        action = AgentAction("get_weather_forecast", {"latitude": 41.88, "longitude": -87.63}, "")
+        
+        result = run_agent("Chicago next week", agent=scripted_agent([(action, FORECAST)]))
+        
+        assert "has_errors" not in result
+        assert "error" not in result
+    
+    def test_reports_agent_exceptions(self):
+        """Test that an exception from the executor becomes a general error result."""
+        def fail(inputs):
+            raise RuntimeError("boom")
+        
+        result = run_agent("Chicago next week", agent=SimpleNamespace(invoke=fail))
+        
+        assert result["error_type"] == "general"
+        assert result["error"] == "boom"
+        assert result["intermediate_steps"] == []
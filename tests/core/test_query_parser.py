@@ -0,0 +1,88 @@
+import pytest
+from core.query_parser import parse_travel_query, _parse_days
+
+
+class TestParseDays:
+    """Test suite for _parse_days function."""
+    
+    @pytest.mark.parametrize("query,expected", [
+        ("What should I pack for Chicago in 7 days?", 7),
+        ("Help me pack for San Francisco 10 days from now", 10),
+        ("Seattle in two weeks", 14),
+        ("Boston in a week", 7),
+        ("Denver tomorrow", 1),
+        ("Denver the day after tomorrow", 2),
+        ("Miami today", 0),
+        ("Austin next week", 7),
+        ("Chicago", None),
+    ])
+    def test_relative_dates(self, query, expected):
+        """Test that supported relative date phrases are converted to days."""
+        assert _parse_days(query) == expected
+    
+    def test_weekend_is_within_a_week(self):
+        """Test that "this weekend" resolves to the coming Saturday."""
+        assert 0 <= _parse_days("Miami this weekend") < 7
+    
+    def test_next_weekend_is_the_following_one(self):
+        """Test that "next weekend" is a week after "this weekend"."""
+        assert _parse_days("Miami next weekend") == _parse_days("Miami this weekend") + 7
+
+
+class TestParseTravelQuery:
+    """Test suite for parse_travel_query function."""
+    
+    @pytest.mark.parametrize("query,city,state", [
+        ("What should I pack for Chicago in 7 days?", "Chicago", "IL"),
+        ("Help me pack for a business trip to New York in 10 days", "New York", "NY"),
+        ("I'm going to Miami next weekend, what should I wear?", "Miami", "FL"),
+        ("What to wear in Salt Lake City today", "Salt Lake City", "UT"),
+        ("Trip to St. Louis", "St. Louis", "MO"),
+        ("Going to Portland, OR in two weeks", "Portland", "OR"),
+        ("Visiting Portland Maine tomorrow", "Portland", "ME"),
+        ("I live in Boston and need to pack for Boston tomorrow", "Boston", "MA"),
+        ("Going to New York City next week", "New York", "NY"),
+        ("Trip to Washington, D.C. next week", "Washington", "DC"),
+        ("Visiting Washington DC tomorrow", "Washington", "DC"),
+        ("Heading to Chicago Friday", "Chicago", "IL"),
+    ])
+    def test_resolves_destination(self, query, city, state):
+        """Test that the destination and state are extracted."""
+        result = parse_travel_query(query)
+        assert result is not None
+        assert result.city == city
+        assert result.state == state
+    
+    def test_includes_coordinates_and_days(self):
+        """Test that the parsed query carries coordinates and the trip offset."""
+        result = parse_travel_query("What should I pack for Chicago in 7 days?")
+        assert result.latitude == pytest.approx(41.88, abs=0.1)
+        assert result.longitude == pytest.approx(-87.63, abs=0.1)
+        assert result.days == 7
+    
+    def test_lowercase_in_is_not_a_state(self):
+        """Test that the word "in" after a city is not read as Indiana."""
+        result = parse_travel_query("pack for Denver in 3 days")
+        assert result.state == "CO"
+    
+    @pytest.mark.parametrize("query", [
+        "What should I pack for Paris in 3 days?",
+        "Going to Portland next week",
+        "Help me pack",
+        "",
+        "Portland, OR in two weeks",
+        "trip from Chicago to Paris in 5 days",
+        "I live in Boston, what should I pack for London?",
+        "Paris trip next week, I am flying from Miami",
+        "Going to Cancun, need boots to climb a boulder",
+        "Heading to Toronto for billings meetings",
+        "I live in Boston and need to pack for Chicago",
+        "hiking trip to Washington state next week",
+        "Going to Washington next week",
+        "Going to Mesa Verde",
+        "Going to Long Beach Island",
+        "heading to Buffalo Wild Wings",
+    ])
+    def test_returns_none_when_unresolved(self, query):
+        """Test that unknown, ambiguous or missing destinations are left to the agent."""
+        assert parse_travel_query(query) is None
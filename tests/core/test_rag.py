@@ -0,0 +1,203 @@
+import asyncio
+import os
+import faiss
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.documents import Document
+from langchain_core.embeddings import FakeEmbeddings
+
+from core import rag
+from core.rag import (
+    HNSW_EF_SEARCH,
+    PQ_MIN_TRAINING_VECTORS,
+    PQ_NPROBE,
+    WardrobeRAG,
+    create_wardrobe_vectorstore,
+    load_wardrobe_knowledge,
+    load_wardrobe_vectorstore,
+    _build_index,
+    _configure_search,
+)
+
+DOCUMENTS = [
+    Document(page_content="Pack a warm coat and gloves.", metadata={"section": "COLD"}),
+    Document(page_content="Bring an umbrella and a rain jacket.", metadata={"section": "RAIN"}),
+    Document(page_content="Shorts, sandals and sunscreen.", metadata={"section": "HOT"}),
+]
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    """Embed with random vectors of the configured size instead of calling OpenAI."""
+    monkeypatch.setattr(
+        rag,
+        "_create_embeddings",
+        lambda embeddings_model, chunk_size=None: FakeEmbeddings(size=rag.EMBEDDING_DIMENSIONS)
+    )
+
+
+@pytest.fixture
+def build_spy(monkeypatch):
+    """Count the vector stores built from the knowledge base."""
+    spy = MagicMock(wraps=create_wardrobe_vectorstore)
+    monkeypatch.setattr(rag, "create_wardrobe_vectorstore", spy)
+    return spy
+
+
+@pytest.fixture
+def write_rules(tmp_path):
+    """Write a knowledge base file and return its path."""
+    def write(content):
+        path = tmp_path / "rules.txt"
+        path.write_text(content)
+        return str(path)
+    return write
+
+
+class TestLoadWardrobeKnowledge:
+    """Test suite for load_wardrobe_knowledge function."""
+    
+    def test_parses_the_default_knowledge_base(self):
+        """Test that data/wardrobe_rules.txt splits into one document per section."""
+        documents = load_wardrobe_knowledge()
+        
+        assert [doc.metadata["section"] for doc in documents] == [
+            "TEMPUS VESTIS WARDROBE & PACKING GUIDE",
+            "TEMPERATURE-BASED RECOMMENDATIONS",
+            "WEATHER CONDITION RECOMMENDATIONS",
+            "ACTIVITY-BASED RECOMMENDATIONS",
+            "TRIP LENGTH GUIDELINES",
+            "PACKING TIPS",
+            "SEASONAL CONSIDERATIONS",
+            "REGIONAL CONSIDERATIONS",
+            "SPECIAL CONSIDERATIONS",
+        ]
+        assert all(doc.page_content for doc in documents)
+    
+    def test_detects_headers_from_the_first_two_lines(self, write_rules):
+        """Test underlined titles, lone all-caps lines and content that only starts in caps."""
+        path = write_rules(
+            "GUIDE\n=====\n\n"
+            "Intro paragraph.\n\n"
+            "PACKING TIPS\n\n"
+            "COLD WEATHER\n- Coat\n- Gloves\n\n"
+            "Hot Weather\n===========\n\n"
+            "Sunscreen."
+        )
+        
+        documents = load_wardrobe_knowledge(path)
+        
+        assert [(doc.metadata["section"], doc.page_content) for doc in documents] == [
+            ("GUIDE", "Intro paragraph."),
+            ("PACKING TIPS", "COLD WEATHER\n- Coat\n- Gloves"),
+            ("Hot Weather", "Sunscreen."),
+        ]
+    
+    def test_memoizes_on_path_and_mtime(self, write_rules):
+        """Test that the file is only parsed again after it changes."""
+        path = write_rules("RULES\n=====\n\nPack light.")
+        first = load_wardrobe_knowledge(path)
+        
+        assert load_wardrobe_knowledge(path)[0] is first[0]
+        
+        write_rules("RULES\n=====\n\nPack heavy.")
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        
+        assert load_wardrobe_knowledge(path)[0].page_content == "Pack heavy."
+
+
+class TestBuildIndex:
+    """Test suite for _build_index and _configure_search functions."""
+    
+    def test_small_knowledge_base_uses_hnsw(self):
+        """Test that too few vectors to train a quantizer get an HNSW graph."""
+        index = _build_index(np.random.rand(9, 512).astype(np.float32))
+        _configure_search(index)
+        
+        assert isinstance(index, faiss.IndexHNSWFlat)
+        assert index.hnsw.efSearch == HNSW_EF_SEARCH
+    
+    def test_large_knowledge_base_uses_trained_ivf_pq(self):
+        """Test that enough vectors get a trained IVF-PQ index."""
+        index = _build_index(np.random.rand(PQ_MIN_TRAINING_VECTORS, 64).astype(np.float32))
+        _configure_search(index)
+        
+        assert isinstance(index, faiss.IndexIVFPQ)
+        assert index.is_trained
+        assert index.nprobe == PQ_NPROBE
+    
+    def test_dimension_not_divisible_by_sub_quantizers_uses_hnsw(self):
+        """Test that vectors PQ cannot split evenly stay in an HNSW graph."""
+        index = _build_index(np.random.rand(PQ_MIN_TRAINING_VECTORS, 96).astype(np.float32))
+        
+        assert isinstance(index, faiss.IndexHNSWFlat)
+
+
+class TestLoadWardrobeVectorstore:
+    """Test suite for load_wardrobe_vectorstore function."""
+    
+    def test_builds_and_saves_when_missing(self, tmp_path, build_spy):
+        """Test that the first load builds the index and writes it to the cache."""
+        vectorstore = load_wardrobe_vectorstore(cache_dir=str(tmp_path))
+        
+        assert build_spy.call_count == 1
+        assert (tmp_path / "index.faiss").exists()
+        assert vectorstore.index.ntotal == 9
+    
+    def test_reuses_the_saved_index(self, tmp_path, build_spy):
+        """Test that a saved index newer than the rules is loaded with its search settings."""
+        load_wardrobe_vectorstore(cache_dir=str(tmp_path))
+        vectorstore = load_wardrobe_vectorstore(cache_dir=str(tmp_path))
+        
+        assert build_spy.call_count == 1
+        assert isinstance(vectorstore.index, faiss.IndexHNSWFlat)
+        assert vectorstore.index.hnsw.efSearch == HNSW_EF_SEARCH
+        assert vectorstore.index.ntotal == 9
+    
+    def test_rebuilds_when_the_rules_are_newer(self, tmp_path, build_spy):
+        """Test that editing the rules after the index was saved triggers a rebuild."""
+        load_wardrobe_vectorstore(cache_dir=str(tmp_path))
+        rules_mtime = os.path.getmtime(rag.DEFAULT_KNOWLEDGE_PATH)
+        os.utime(tmp_path / "index.faiss", (rules_mtime - 10, rules_mtime - 10))
+        
+        load_wardrobe_vectorstore(cache_dir=str(tmp_path))
+        
+        assert build_spy.call_count == 2
+
+
+class TestWardrobeRAG:
+    """Test suite for WardrobeRAG retrieval."""
+    
+    @pytest.fixture
+    def wardrobe(self, monkeypatch):
+        """Build a WardrobeRAG over DOCUMENTS with a spy on its retriever."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        vectorstore = create_wardrobe_vectorstore(DOCUMENTS)
+        monkeypatch.setattr(rag, "load_wardrobe_vectorstore", lambda: vectorstore)
+        wardrobe = WardrobeRAG(k=2)
+        wardrobe.retriever = MagicMock(wraps=wardrobe.retriever)
+        return wardrobe
+    
+    def test_search_knowledge_reuses_the_retriever(self, wardrobe):
+        """Test that searches with the default k go through the shared retriever."""
+        wardrobe.search_knowledge("coat", k=2)
+        results = wardrobe.search_knowledge("rain", k=2)
+        
+        assert wardrobe.retriever.invoke.call_count == 2
+        assert len(results) == 2
+    
+    def test_search_knowledge_with_other_k_searches_directly(self, wardrobe):
+        """Test that a different k bypasses the retriever."""
+        results = wardrobe.search_knowledge("coat", k=3)
+        
+        assert wardrobe.retriever.invoke.call_count == 0
+        assert len(results) == 3
+    
+    def test_aretrieve_context_uses_the_retriever(self, wardrobe):
+        """Test that context is retrieved through the shared retriever."""
+        context = asyncio.run(wardrobe.aretrieve_context("coat"))
+        
+        assert wardrobe.retriever.ainvoke.call_count == 1
+        assert len(context.split("\n\n")) == 2
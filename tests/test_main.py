@@ -0,0 +1,283 @@
+import asyncio
+import pytest
+from langchain_core.agents import AgentAction
+
+import main
+from core import query_parser
+from core.prompts import CHAIN_ERROR_MESSAGE, WEATHER_ERROR_MESSAGE
+from core.query_parser import TravelQuery
+from main import (
+    batch_query_mode,
+    parse_args,
+    print_stream,
+    run_sequential_chain,
+    run_sequential_chain_batch,
+)
+from tools import weather_api
+from tools.weather_api import WeatherError
+
+FORECAST = {"properties": {"periods": [{"name": "Today", "temperature": 70}]}}
+
+# Destinations the stub parser resolves, keyed by query; the latitude picks
+# the stub forecast
+TRAVELS = {
+    "Chicago tomorrow": TravelQuery("Chicago", "IL", 1.0, 0.0, 1),
+    "Miami tomorrow": TravelQuery("Miami", "FL", 2.0, 0.0, 1),
+    "Denver tomorrow": TravelQuery("Denver", "CO", 3.0, 0.0, 1),
+    "Boston tomorrow": TravelQuery("Boston", "MA", 4.0, 0.0, 1),
+}
+FORECASTS = {
+    1.0: FORECAST,
+    2.0: RuntimeError("NWS timed out"),
+    3.0: WeatherError("Unable to provide data for requested point"),
+    4.0: FORECAST,
+}
+
+WEATHER_ACTION = AgentAction("get_weather_forecast", {"latitude": 0.0, "longitude": 0.0}, "")
+AGENT_RESULTS = {
+    "somewhere sunny": {"output": FORECAST, "intermediate_steps": [(WEATHER_ACTION, FORECAST)]},
+    "somewhere": {"output": "Which city are you visiting?", "intermediate_steps": []},
+    "somewhere broken": RuntimeError("agent failed"),
+}
+
+
+class StubAgent:
+    """Stand-in for WardrobeAgent answering from AGENT_RESULTS."""
+    
+    def __init__(self):
+        self.queries = []
+    
+    async def aget_detailed_response(self, query):
+        self.queries.append(query)
+        result = AGENT_RESULTS[query]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    async def aget_detailed_responses(self, queries, max_concurrency=8):
+        self.queries.extend(queries)
+        return list(map(AGENT_RESULTS.get, queries))
+
+
+class StubRAG:
+    """Stand-in for WardrobeRAG that writes one line per query."""
+    
+    def __init__(self):
+        self.contexts = []
+    
+    async def aretrieve_context(self, query):
+        return f"guidelines for {query}"
+    
+    async def astream_recommendations(self, query, weather_info, context=None):
+        self.contexts.append(context)
+        for chunk in ("Pack ", "for ", query):
+            yield chunk
+    
+    def get_recommendations_batch(self, queries, weather_infos, max_concurrency=8):
+        return [
+            RuntimeError("RAG failed") if query == "Boston tomorrow" else f"Pack for {query}"
+            for query in queries
+        ]
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    """Replace the parser, NWS, agent and RAG steps of the chain with stubs."""
+    async def forecast(latitude, longitude):
+        result = FORECASTS[latitude]
+        if isinstance(result, RuntimeError):
+            raise result
+        return result
+    
+    agent, rag = StubAgent(), StubRAG()
+    monkeypatch.setattr(query_parser, "parse_travel_query", TRAVELS.get)
+    monkeypatch.setattr(weather_api, "aget_weather_forecast", forecast)
+    monkeypatch.setattr(main, "_get_agent", lambda verbose=False: agent)
+    monkeypatch.setattr(main, "_get_rag", lambda: rag)
+    return agent, rag
+
+
+class TestParseArgs:
+    """Test suite for parse_args function."""
+    
+    def test_no_arguments_means_interactive_mode(self):
+        """Test that no arguments leave both the query and the file unset."""
+        args = parse_args([])
+        assert args.query == []
+        assert args.queries_file is None
+    
+    def test_collects_query_words(self):
+        """Test that the words of an unquoted query are all kept."""
+        args = parse_args(["What", "should", "I", "pack", "for", "Chicago?"])
+        assert " ".join(args.query) == "What should I pack for Chicago?"
+        assert args.queries_file is None
+    
+    def test_reads_queries_file(self):
+        """Test that --queries-file takes the path that follows it."""
+        args = parse_args(["--queries-file", "trips.txt"])
+        assert args.queries_file == "trips.txt"
+        assert args.query == []
+    
+    @pytest.mark.parametrize("argv", [
+        ["--queries-file"],
+        ["--queries-file", "trips.txt", "extra"],
+        ["Chicago", "--queries-file", "trips.txt"],
+    ], ids=["missing path", "extra argument", "query before flag"])
+    def test_rejects_invalid_usage(self, argv, capsys):
+        """Test that malformed batch invocations exit with a usage error."""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args(argv)
+        
+        assert exc_info.value.code == 2
+        assert capsys.readouterr().out.startswith("❌ ERROR:")
+
+
+class TestBatchQueryMode:
+    """Test suite for batch_query_mode error handling."""
+    
+    @pytest.fixture(autouse=True)
+    def no_batch_run(self, monkeypatch):
+        """Fail the test if any query would be sent to the chain."""
+        def run(queries, verbose=False):
+            raise AssertionError("queries should not be run")
+        monkeypatch.setattr(main, "run_sequential_chain_batch", run)
+    
+    def test_missing_file_exits_with_message(self, tmp_path, capsys):
+        """Test that a missing queries file is reported without a traceback."""
+        path = tmp_path / "missing.txt"
+        
+        with pytest.raises(SystemExit) as exc_info:
+            batch_query_mode(str(path))
+        
+        assert exc_info.value.code == 1
+        assert f"❌ ERROR: Could not read queries file {path}" in capsys.readouterr().out
+    
+    def test_directory_exits_with_message(self, tmp_path, capsys):
+        """Test that a directory passed as the queries file is reported."""
+        with pytest.raises(SystemExit):
+            batch_query_mode(str(tmp_path))
+        
+        assert "❌ ERROR: Could not read queries file" in capsys.readouterr().out
+    
+    def test_empty_file_reports_no_queries(self, tmp_path, capsys):
+        """Test that a file with only blank lines runs nothing."""
+        path = tmp_path / "trips.txt"
+        path.write_text("\n   \n")
+        
+        batch_query_mode(str(path))
+        
+        assert f"❌ No queries found in {path}" in capsys.readouterr().out
+
+
+class TestRunSequentialChainBatch:
+    """Test suite for run_sequential_chain_batch function."""
+    
+    def test_replies_in_input_order(self, stubs):
+        """Test that direct, agent, failing and weatherless queries keep their places."""
+        queries = [
+            "somewhere sunny",
+            "Chicago tomorrow",
+            "somewhere",
+            "Miami tomorrow",
+            "somewhere broken",
+            "Denver tomorrow",
+            "Boston tomorrow",
+        ]
+        
+        responses = run_sequential_chain_batch(queries)
+        
+        assert responses == [
+            "Pack for somewhere sunny",
+            "Pack for Chicago tomorrow",
+            "Which city are you visiting?",
+            CHAIN_ERROR_MESSAGE.format(error="NWS timed out"),
+            CHAIN_ERROR_MESSAGE.format(error="agent failed"),
+            WEATHER_ERROR_MESSAGE.format(error="Unable to provide data for requested point"),
+            CHAIN_ERROR_MESSAGE.format(error="RAG failed"),
+        ]
+        agent, _ = stubs
+        assert agent.queries == ["somewhere sunny", "somewhere", "somewhere broken"]
+    
+    def test_skips_the_agent_when_every_query_is_parsed(self, stubs, monkeypatch):
+        """Test that a fully parsed batch never builds the agent."""
+        def no_agent(verbose=False):
+            raise AssertionError("the agent should not be built")
+        monkeypatch.setattr(main, "_get_agent", no_agent)
+        
+        responses = run_sequential_chain_batch(["Chicago tomorrow", "Denver tomorrow"])
+        
+        assert responses == [
+            "Pack for Chicago tomorrow",
+            WEATHER_ERROR_MESSAGE.format(error="Unable to provide data for requested point"),
+        ]
+
+
+class TestStreamSequentialChain:
+    """Test suite for stream_sequential_chain and its weather step."""
+    
+    @pytest.mark.parametrize("query", ["Chicago tomorrow", "somewhere sunny"], ids=["direct", "agent"])
+    def test_passes_retrieved_context_to_rag(self, stubs, query):
+        """Test that the context retrieved alongside the weather reaches the RAG step."""
+        agent, rag = stubs
+        
+        response = asyncio.run(run_sequential_chain(query))
+        
+        assert response == f"Pack for {query}"
+        assert rag.contexts == [f"guidelines for {query}"]
+        assert agent.queries == ([] if query in TRAVELS else [query])
+    
+    def test_weather_error_on_direct_path(self, stubs):
+        """Test that a WeatherError for a parsed destination skips the RAG step."""
+        _, rag = stubs
+        
+        response = asyncio.run(run_sequential_chain("Denver tomorrow"))
+        
+        assert response == WEATHER_ERROR_MESSAGE.format(error="Unable to provide data for requested point")
+        assert rag.contexts == []
+    
+    def test_falls_back_to_agent_output_without_weather(self, stubs):
+        """Test that the agent's answer is used when it fetched no forecast."""
+        response = asyncio.run(run_sequential_chain("somewhere"))
+        
+        assert response == "Which city are you visiting?"
+    
+    def test_reports_failures(self, stubs):
+        """Test that an exception in the chain becomes the error reply."""
+        response = asyncio.run(run_sequential_chain("somewhere broken"))
+        
+        assert response == CHAIN_ERROR_MESSAGE.format(error="agent failed")
+    
+    def test_retrieves_context_while_fetching_weather(self, stubs, monkeypatch):
+        """Test that retrieval runs concurrently with the weather lookup."""
+        _, rag = stubs
+        retrieving = asyncio.Event()
+        
+        async def forecast(latitude, longitude):
+            # Only finishes if retrieval has started before the forecast returns
+            await asyncio.wait_for(retrieving.wait(), timeout=1)
+            return FORECAST
+        
+        async def retrieve(query):
+            retrieving.set()
+            return f"guidelines for {query}"
+        
+        monkeypatch.setattr(weather_api, "aget_weather_forecast", forecast)
+        monkeypatch.setattr(rag, "aretrieve_context", retrieve)
+        
+        response = asyncio.run(run_sequential_chain("Chicago tomorrow"))
+        
+        assert response == "Pack for Chicago tomorrow"
+
+
+class TestPrintStream:
+    """Test suite for print_stream function."""
+    
+    def test_prints_chunks_after_a_blank_line(self, capsys):
+        """Test that chunks are written as they arrive, separated from progress output."""
+        async def chunks():
+            yield "Pack "
+            yield "a coat."
+        
+        asyncio.run(print_stream(chunks()))
+        
+        assert capsys.readouterr().out == "\nPack a coat.\n"
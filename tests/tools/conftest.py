@@ -0,0 +1,42 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from tools import date_ops, weather_api
+
+
+@pytest.fixture(autouse=True)
+def clear_weather_caches():
+    """Start every test with empty NWS response caches."""
+    weather_api._forecast_url_cache.clear()
+    weather_api._forecast_cache.clear()
+    yield
+    weather_api._forecast_url_cache.clear()
+    weather_api._forecast_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def mock_requests_get(monkeypatch):
+    """Replace requests.get for the weather API with one MagicMock per test."""
+    mock = MagicMock()
+    monkeypatch.setattr('tools.weather_api.requests.get', mock)
+    return mock
+
+
+@pytest.fixture
+def frozen_datetime(request, monkeypatch):
+    """
+    Freeze the clock seen by tools.date_ops.
+
+    Swaps the module's datetime for a small stub instead of a MagicMock. The
+    frozen time is 2025-10-09 12:30:45 unless the test parametrizes this
+    fixture indirectly with another datetime.
+    """
+    frozen = getattr(request, "param", datetime(2025, 10, 9, 12, 30, 45))
+    
+    class _StubDatetime:
+        now = staticmethod(lambda: frozen)
+        strptime = staticmethod(datetime.strptime)
+    
+    monkeypatch.setattr(date_ops, "datetime", _StubDatetime)
+    return frozen
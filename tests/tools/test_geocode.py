@@ -0,0 +1,113 @@
+import pytest
+from tools.geocode import (
+    find_places,
+    geocode_us_city,
+    lookup_city,
+    normalize_city_name,
+    normalize_state,
+    _load_gazetteer,
+)
+
+
+class TestNormalize:
+    """Test suite for the name normalization helpers."""
+    
+    @pytest.mark.parametrize("name,expected", [
+        ("Chicago", "chicago"),
+        ("  Salt   Lake City ", "salt lake city"),
+        ("St. Louis", "saint louis"),
+        ("st louis", "saint louis"),
+    ])
+    def test_normalize_city_name(self, name, expected):
+        """Test that city names are normalized for lookup."""
+        assert normalize_city_name(name) == expected
+    
+    @pytest.mark.parametrize("state,expected", [
+        ("IL", "IL"),
+        ("il", "IL"),
+        ("Illinois", "IL"),
+        ("new york", "NY"),
+        ("Narnia", None),
+    ])
+    def test_normalize_state(self, state, expected):
+        """Test that state codes and names map to the two-letter code."""
+        assert normalize_state(state) == expected
+
+
+class TestLookupCity:
+    """Test suite for lookup_city function."""
+    
+    def test_returns_coordinates_for_known_city(self):
+        """Test that a known city resolves to its coordinates."""
+        latitude, longitude = lookup_city("Chicago")
+        assert latitude == pytest.approx(41.88, abs=0.1)
+        assert longitude == pytest.approx(-87.63, abs=0.1)
+    
+    def test_is_case_insensitive(self):
+        """Test that lookups ignore case."""
+        assert lookup_city("san francisco") == lookup_city("San Francisco")
+    
+    def test_returns_none_for_unknown_city(self):
+        """Test that unknown places are not guessed."""
+        assert lookup_city("Paris") is None
+    
+    def test_returns_none_for_ambiguous_city(self):
+        """Test that a city in several states needs a state to resolve."""
+        assert len(find_places("Portland")) == 2
+        assert lookup_city("Portland") is None
+    
+    @pytest.mark.parametrize("state", ["ME", "Maine"])
+    def test_state_disambiguates(self, state):
+        """Test that giving the state picks the right city."""
+        latitude, longitude = lookup_city("Portland", state)
+        assert latitude == pytest.approx(43.66, abs=0.1)
+        assert longitude == pytest.approx(-70.26, abs=0.1)
+    
+    def test_returns_none_for_wrong_state(self):
+        """Test that a city is not matched in a state it is not in."""
+        assert lookup_city("Chicago", "TX") is None
+
+
+class TestGeocodeUsCity:
+    """Test suite for the geocode_us_city tool."""
+    
+    def test_returns_coordinates(self):
+        """Test that the tool returns the city's latitude and longitude."""
+        result = geocode_us_city.invoke({"city": "Portland", "state": "OR"})
+        assert result == lookup_city("Portland", "OR")
+    
+    def test_asks_for_state_when_ambiguous(self):
+        """Test that an ambiguous city reports the states it exists in."""
+        result = geocode_us_city.invoke({"city": "Portland"})
+        assert "ME, OR" in result
+    
+    def test_reports_unknown_city(self):
+        """Test that unknown cities are reported instead of guessed."""
+        result = geocode_us_city.invoke({"city": "Paris", "state": "France"})
+        assert result == "Paris, France is not a known US city."
+    
+    def test_tool_metadata(self):
+        """Test the tool's name and arguments as seen by the agent."""
+        assert geocode_us_city.name == "geocode_us_city"
+        assert set(geocode_us_city.args) == {"city", "state"}
+
+
+class TestLoadGazetteer:
+    """Test suite for reading gazetteer files."""
+    
+    def test_reads_census_gazetteer_format(self, tmp_path):
+        """Test that a Census places file is parsed, dropping the area type suffix."""
+        path = tmp_path / "places.txt"
+        path.write_text(
+            "USPS\tGEOID\tANSICODE\tNAME\tLSAD\tFUNCSTAT\tALAND\tAWATER\t"
+            "ALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG    \n"
+            "IL\t1714000\t00428803\tChicago city\t25\tA\t589763408\t17022154\t"
+            "227.709\t6.572\t41.837551\t-87.681844\n"
+            "HI\t1571550\t02630783\tUrban Honolulu CDP\t57\tS\t156748059\t20830316\t"
+            "60.521\t8.043\t21.325811\t-157.845099\n"
+        )
+        
+        places = _load_gazetteer(str(path))
+        
+        assert places["chicago"][0].state == "IL"
+        assert places["urban honolulu"][0].latitude == pytest.approx(21.325811)
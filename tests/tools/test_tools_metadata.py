@@ -0,0 +1,25 @@
+import pytest
+from tools.date_ops import get_current_date, calculate_future_date
+from tools.geocode import geocode_us_city
+from tools.weather_api import get_weather_forecast
+
+
+@pytest.mark.parametrize("tool", [
+    get_current_date,
+    calculate_future_date,
+    geocode_us_city,
+    get_weather_forecast,
+], ids=lambda tool: tool.name)
+def test_tool_has_description(tool):
+    """Test that the tool has a description for LangChain."""
+    assert tool.description
+
+
+@pytest.mark.parametrize("tool", [
+    calculate_future_date,
+    geocode_us_city,
+    get_weather_forecast,
+], ids=lambda tool: tool.name)
+def test_tool_has_args_schema(tool):
+    """Test that the tool has an args schema for LangChain."""
+    assert tool.args_schema is not None
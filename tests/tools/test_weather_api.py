@@ -1,84 +1,172 @@
+import asyncio
+import httpx
 import pytest
-from unittest.mock import patch, Mock
-from tools.weather_api import get_weather_forecast, _get_forecast_url, _get_summary
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import Mock
+from tools import weather_api
+from tools.weather_api import WeatherError, get_weather_forecast, aget_weather_forecast, _get_forecast_url, _get_summary
 from tools.constants import NWS_BASE_URL
 
+_wx = get_weather_forecast.invoke
+
+
+def _resp(data, status_code=200, headers=None):
+    """Build a minimal stand-in for a requests response returning the given JSON."""
+    return SimpleNamespace(json=lambda: data, status_code=status_code, headers=headers or {})
+
+
+@lru_cache(maxsize=8)
+def _points_response(forecast_url):
+    """
+    Build a points API response pointing at the given forecast URL.
+    
+    Responses are shared between tests, so they must not be mutated.
+    """
+    return _resp({"properties": {"forecast": forecast_url}})
+
+
+# Canned NWS responses by request URL, shared by the tests that use nws_routes
+_NWS_ROUTES = {
+    f"{NWS_BASE_URL}/points/39.7456,-97.0892": _points_response("https://api.weather.gov/gridpoints/TOP/31,80/forecast"),
+    f"{NWS_BASE_URL}/points/34.0522,-118.2437": _points_response("https://api.weather.gov/gridpoints/LOX/123,456/forecast"),
+    f"{NWS_BASE_URL}/points/0.0,0.0": _points_response("https://api.weather.gov/gridpoints/TEST/0,0/forecast"),
+    "https://api.weather.gov/gridpoints/TOP/31,80/forecast": _resp({"properties": {"periods": []}}),
+    "https://api.weather.gov/gridpoints/LOX/123,456/forecast": _resp({"properties": {"periods": []}}),
+    "https://api.weather.gov/gridpoints/TEST/0,0/forecast": _resp({"properties": {"periods": []}}),
+}
+
+
+@pytest.fixture
+def nws_routes(mock_requests_get):
+    """Answer requests.get from _NWS_ROUTES by URL instead of by call order."""
+    mock_requests_get.side_effect = lambda url, **kwargs: _NWS_ROUTES[url]
+    return mock_requests_get
+
+
+# Standard points -> forecast response sequence for the test coordinate;
+# side_effect takes a fresh iterator over it in each test
+_STD_FORECAST = {
+    "properties": {
+        "periods": [
+            {
+                "name": "Today",
+                "temperature": 75,
+                "temperatureUnit": "F",
+                "shortForecast": "Sunny"
+            }
+        ]
+    }
+}
+_STD_SIDE_EFFECT = (
+    _points_response("https://api.weather.gov/gridpoints/TOP/31,80/forecast"),
+    _resp(_STD_FORECAST),
+)
+
+
+# Tool inputs for test_various_us_locations
+_US_LOCATION_PAYLOADS = (
+    {"latitude": 39.7456, "longitude": -97.0892},  # Kansas
+    {"latitude": 34.0522, "longitude": -118.2437},  # Los Angeles
+    {"latitude": 40.7128, "longitude": -74.0060},  # New York
+    {"latitude": 25.7617, "longitude": -80.1918},  # Miami
+    {"latitude": 47.6062, "longitude": -122.3321},  # Seattle
+)
+
+
+@pytest.fixture(scope="module")
+def _us_location_responses():
+    """Points and forecast responses shared by every test_various_us_locations case."""
+    return (
+        _points_response("https://api.weather.gov/gridpoints/TEST/1,2/forecast"),
+        _resp({"properties": {"periods": [{"name": "Today", "temperature": 70}]}}),
+    )
+
 
 class TestGetForecastUrl:
     """Test suite for _get_forecast_url helper function."""
     
-    @patch('tools.weather_api.requests.get')
-    def test_returns_forecast_url(self, mock_get):
-        """Test that _get_forecast_url returns the correct forecast URL."""
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
-            }
-        }
-        mock_get.return_value = mock_response
+    @pytest.mark.parametrize("lat,lon,forecast_url", [
+        (39.7456, -97.0892, "https://api.weather.gov/gridpoints/TOP/31,80/forecast"),
+        (34.0522, -118.2437, "https://api.weather.gov/gridpoints/LOX/123,456/forecast"),  # Los Angeles
+        (-10.5, -75.3, "https://api.weather.gov/gridpoints/TEST/1,2/forecast"),  # Negative coordinates
+    ])
+    def test_forecast_url(self, mock_requests_get, lat, lon, forecast_url):
+        """Test that _get_forecast_url queries the points API and returns its forecast URL."""
+        mock_requests_get.return_value = _points_response(forecast_url)
         
-        result = _get_forecast_url(39.7456, -97.0892)
+        result = _get_forecast_url(lat, lon)
         
         # Verify the correct URL was called
-        expected_url = f"{NWS_BASE_URL}/points/39.7456,-97.0892"
-        mock_get.assert_called_once_with(expected_url)
+        expected_url = f"{NWS_BASE_URL}/points/{lat},{lon}"
+        assert mock_requests_get.call_count == 1
+        assert mock_requests_get.call_args.args == (expected_url,)
+        assert not mock_requests_get.call_args.kwargs
         
         # Verify the correct forecast URL was returned
-        assert result == "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
+        assert result == forecast_url
     
-    @patch('tools.weather_api.requests.get')
-    def test_handles_different_coordinates(self, mock_get):
-        """Test _get_forecast_url with different coordinate values."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/LOX/123,456/forecast"
-            }
-        }
-        mock_get.return_value = mock_response
+    def test_returns_weather_error_on_invalid_response(self, mock_requests_get):
+        """Test _get_forecast_url returns a WeatherError when API response is malformed."""
+        mock_requests_get.return_value = _resp({"invalid": "response"})
         
-        result = _get_forecast_url(34.0522, -118.2437)  # Los Angeles
+        result = _get_forecast_url(39.7456, -97.0892)
         
-        expected_url = f"{NWS_BASE_URL}/points/34.0522,-118.2437"
-        mock_get.assert_called_once_with(expected_url)
-        assert result == "https://api.weather.gov/gridpoints/LOX/123,456/forecast"
+        assert isinstance(result, WeatherError)
+        assert "39.7456,-97.0892" in result.message
     
-    @patch('tools.weather_api.requests.get')
-    def test_handles_negative_coordinates(self, mock_get):
-        """Test _get_forecast_url with negative latitude and longitude."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TEST/1,2/forecast"
-            }
-        }
-        mock_get.return_value = mock_response
+    def test_returns_weather_error_for_point_outside_us(self, mock_requests_get):
+        """Test get_weather_forecast returns the NWS error detail without fetching a forecast."""
+        mock_requests_get.return_value = _resp({
+            "title": "Data Unavailable For Requested Point",
+            "detail": "Unable to provide data for requested point 48.8566,2.3522",
+            "status": 404
+        }, status_code=404)
+        
+        result = _wx({"latitude": 48.8566, "longitude": 2.3522})
+        
+        assert result == WeatherError("Unable to provide data for requested point 48.8566,2.3522")
+        assert str(result).startswith("Weather error: ")
+        assert mock_requests_get.call_count == 1
+    
+    @pytest.mark.parametrize("forecast_response,message", [
+        (_resp({
+            "title": "Unexpected Problem",
+            "detail": "An unexpected problem has occurred.",
+            "status": 500
+        }, status_code=500), "An unexpected problem has occurred."),
+        (_resp({"title": "Service Unavailable", "status": 503}, status_code=503), "Service Unavailable"),
+        (SimpleNamespace(json=Mock(side_effect=ValueError("Invalid JSON")), status_code=502, headers={}),
+         "The forecast request failed with HTTP status 502"),
+    ], ids=["detail", "title only", "no json"])
+    def test_returns_weather_error_for_forecast_server_error(self, mock_requests_get, forecast_response, message):
+        """Test get_weather_forecast returns a WeatherError instead of an NWS error document."""
+        mock_requests_get.side_effect = [
+            _points_response("https://api.weather.gov/gridpoints/TOP/31,80/forecast"),
+            forecast_response,
+        ]
+        
+        result = _wx({"latitude": 39.7456, "longitude": -97.0892})
+        
+        assert result == WeatherError(message)
+        assert not weather_api._forecast_cache
+    
+    def test_caches_forecast_url_per_coordinate(self, mock_requests_get):
+        """Test _get_forecast_url only queries the points API once per coordinate."""
+        mock_requests_get.return_value = _points_response("https://api.weather.gov/gridpoints/TOP/31,80/forecast")
         
-        result = _get_forecast_url(-10.5, -75.3)
+        first = _get_forecast_url(39.7456, -97.0892)
+        second = _get_forecast_url(39.7456, -97.0892)
         
-        expected_url = f"{NWS_BASE_URL}/points/-10.5,-75.3"
-        mock_get.assert_called_once_with(expected_url)
-        assert isinstance(result, str)
-    
-    @patch('tools.weather_api.requests.get')
-    def test_raises_key_error_on_invalid_response(self, mock_get):
-        """Test _get_forecast_url raises error when API response is malformed."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"invalid": "response"}
-        mock_get.return_value = mock_response
-        
-        with pytest.raises(KeyError):
-            _get_forecast_url(39.7456, -97.0892)
+        assert first == second
+        assert mock_requests_get.call_count == 1
 
 
 class TestGetSummary:
     """Test suite for _get_summary helper function."""
     
-    def test_returns_forecast_data(self):
-        """Test that _get_summary returns the forecast data."""
-        forecast = {
+    @pytest.mark.parametrize("forecast", [
+        {
             "properties": {
                 "periods": [
                     {
@@ -89,79 +177,44 @@ class TestGetSummary:
                     }
                 ]
             }
-        }
-        
-        result = _get_summary(forecast)
-        assert result == forecast
-    
-    def test_handles_empty_forecast(self):
-        """Test _get_summary with empty forecast."""
-        forecast = {}
-        result = _get_summary(forecast)
-        assert result == {}
-    
-    def test_handles_none_forecast(self):
-        """Test _get_summary with None."""
-        forecast = None
-        result = _get_summary(forecast)
-        assert result is None
+        },
+        {},
+        None,
+    ], ids=["forecast", "empty", "none"])
+    def test_returns_forecast_unchanged(self, forecast):
+        """Test that _get_summary returns the forecast data as given."""
+        assert _get_summary(forecast) == forecast
 
 
 class TestGetWeatherForecast:
     """Test suite for get_weather_forecast tool function."""
     
-    @patch('tools.weather_api.requests.get')
-    def test_returns_summarized_forecast_by_default(self, mock_get):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def _points_json(cls):
+        """Points API body shared by the tests in this class; must not be mutated."""
+        return {"properties": {"forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"}}
+    
+    def test_returns_summarized_forecast_by_default(self, mock_requests_get):
         """Test that get_weather_forecast returns summarized data by default."""
-        # Mock the points API call
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
-            }
-        }
+        # Mock the points API call, then the forecast API call
+        mock_requests_get.side_effect = iter(_STD_SIDE_EFFECT)
         
-        # Mock the forecast API call
-        mock_forecast_response = Mock()
-        forecast_data = {
-            "properties": {
-                "periods": [
-                    {
-                        "name": "Today",
-                        "temperature": 75,
-                        "temperatureUnit": "F",
-                        "shortForecast": "Sunny"
-                    }
-                ]
-            }
-        }
-        mock_forecast_response.json.return_value = forecast_data
-        
-        # Configure mock to return different responses for different calls
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
-        
-        result = get_weather_forecast.invoke({
+        result = _wx({
             "latitude": 39.7456,
             "longitude": -97.0892
         })
         
         # Verify both API calls were made
-        assert mock_get.call_count == 2
+        assert mock_requests_get.call_count == 2
         
         # Verify the result is the forecast data (summarized)
-        assert result == forecast_data
+        assert result == _STD_FORECAST
     
-    @patch('tools.weather_api.requests.get')
-    def test_returns_full_forecast_when_summarize_false(self, mock_get):
+    def test_returns_full_forecast_when_summarize_false(self, mock_requests_get, _points_json):
         """Test that get_weather_forecast returns full data when summarize=False."""
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
-            }
-        }
+        mock_points_response = _resp(_points_json)
         
-        mock_forecast_response = Mock()
         forecast_data = {
             "properties": {
                 "periods": [
@@ -175,55 +228,34 @@ class TestGetWeatherForecast:
             },
             "metadata": {"extra": "data"}
         }
-        mock_forecast_response.json.return_value = forecast_data
+        mock_forecast_response = _resp(forecast_data)
         
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
+        mock_requests_get.side_effect = [mock_points_response, mock_forecast_response]
         
-        result = get_weather_forecast.invoke({
+        result = _wx({
             "latitude": 39.7456,
             "longitude": -97.0892,
             "summarize": False
         })
         
-        assert mock_get.call_count == 2
+        assert mock_requests_get.call_count == 2
         assert result == forecast_data
     
-    @patch('tools.weather_api.requests.get')
-    def test_handles_different_locations(self, mock_get):
+    def test_handles_different_locations(self, nws_routes):
         """Test get_weather_forecast with different locations."""
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/LOX/123,456/forecast"
-            }
-        }
-        
-        mock_forecast_response = Mock()
-        forecast_data = {"properties": {"periods": []}}
-        mock_forecast_response.json.return_value = forecast_data
-        
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
-        
-        result = get_weather_forecast.invoke({
+        _wx({
             "latitude": 34.0522,
             "longitude": -118.2437
         })
         
         # Verify the points API was called with correct coordinates
-        points_call = mock_get.call_args_list[0]
+        points_call = nws_routes.call_args_list[0]
         assert "34.0522,-118.2437" in points_call[0][0]
     
-    @patch('tools.weather_api.requests.get')
-    def test_handles_multiple_forecast_periods(self, mock_get):
+    def test_handles_multiple_forecast_periods(self, mock_requests_get, _points_json):
         """Test get_weather_forecast with multiple forecast periods."""
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
-            }
-        }
+        mock_points_response = _resp(_points_json)
         
-        mock_forecast_response = Mock()
         forecast_data = {
             "properties": {
                 "periods": [
@@ -248,11 +280,11 @@ class TestGetWeatherForecast:
                 ]
             }
         }
-        mock_forecast_response.json.return_value = forecast_data
+        mock_forecast_response = _resp(forecast_data)
         
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
+        mock_requests_get.side_effect = [mock_points_response, mock_forecast_response]
         
-        result = get_weather_forecast.invoke({
+        result = _wx({
             "latitude": 39.7456,
             "longitude": -97.0892,
             "summarize": True
@@ -261,146 +293,171 @@ class TestGetWeatherForecast:
         assert result == forecast_data
         assert len(result["properties"]["periods"]) == 3
     
-    @patch('tools.weather_api.requests.get')
-    def test_handles_api_error_in_points_call(self, mock_get):
+    def test_handles_api_error_in_points_call(self, mock_requests_get):
         """Test get_weather_forecast handles errors in the points API call."""
-        mock_get.side_effect = Exception("API Error")
+        mock_requests_get.side_effect = Exception("API Error")
         
         with pytest.raises(Exception, match="API Error"):
-            get_weather_forecast.invoke({
+            _wx({
                 "latitude": 39.7456,
                 "longitude": -97.0892
             })
     
-    @patch('tools.weather_api.requests.get')
-    def test_handles_api_error_in_forecast_call(self, mock_get):
+    def test_handles_api_error_in_forecast_call(self, mock_requests_get, _points_json):
         """Test get_weather_forecast handles errors in the forecast API call."""
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
-            }
-        }
+        mock_points_response = _resp(_points_json)
         
         # First call succeeds, second call fails
-        mock_get.side_effect = [mock_points_response, Exception("Forecast API Error")]
+        mock_requests_get.side_effect = [mock_points_response, Exception("Forecast API Error")]
         
         with pytest.raises(Exception, match="Forecast API Error"):
-            get_weather_forecast.invoke({
+            _wx({
                 "latitude": 39.7456,
                 "longitude": -97.0892
             })
     
-    @patch('tools.weather_api.requests.get')
-    def test_handles_malformed_json_in_forecast(self, mock_get):
+    def test_handles_malformed_json_in_forecast(self, mock_requests_get, _points_json):
         """Test get_weather_forecast handles malformed JSON in forecast response."""
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
-            }
-        }
+        mock_points_response = _resp(_points_json)
+        
+        def invalid_json():
+            raise ValueError("Invalid JSON")
         
-        mock_forecast_response = Mock()
-        mock_forecast_response.json.side_effect = ValueError("Invalid JSON")
+        mock_forecast_response = SimpleNamespace(json=invalid_json, status_code=200, headers={})
         
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
+        mock_requests_get.side_effect = [mock_points_response, mock_forecast_response]
         
         with pytest.raises(ValueError, match="Invalid JSON"):
-            get_weather_forecast.invoke({
+            _wx({
                 "latitude": 39.7456,
                 "longitude": -97.0892
             })
     
-    @patch('tools.weather_api.requests.get')
-    def test_forecast_url_construction(self, mock_get):
+    def test_forecast_url_construction(self, nws_routes):
         """Test that the correct forecast URL is called."""
-        mock_points_response = Mock()
         expected_forecast_url = "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": expected_forecast_url
-            }
-        }
-        
-        mock_forecast_response = Mock()
-        mock_forecast_response.json.return_value = {"properties": {"periods": []}}
         
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
-        
-        get_weather_forecast.invoke({
+        _wx({
             "latitude": 39.7456,
             "longitude": -97.0892
         })
         
         # Verify the forecast URL was called correctly
-        forecast_call = mock_get.call_args_list[1]
+        forecast_call = nws_routes.call_args_list[1]
         assert forecast_call[0][0] == expected_forecast_url
     
-    @patch('tools.weather_api.requests.get')
-    def test_with_zero_coordinates(self, mock_get):
+    def test_with_zero_coordinates(self, nws_routes):
         """Test get_weather_forecast with zero latitude and longitude."""
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": "https://api.weather.gov/gridpoints/TEST/0,0/forecast"
-            }
-        }
-        
-        mock_forecast_response = Mock()
-        mock_forecast_response.json.return_value = {"properties": {"periods": []}}
-        
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
-        
-        result = get_weather_forecast.invoke({
+        result = _wx({
             "latitude": 0.0,
             "longitude": 0.0
         })
         
         assert result is not None
-        points_call = mock_get.call_args_list[0]
+        points_call = nws_routes.call_args_list[0]
         assert "0.0,0.0" in points_call[0][0]
     
-    def test_tool_has_description(self):
-        """Test that the tool has a description for LangChain."""
-        assert get_weather_forecast.description is not None
-        assert len(get_weather_forecast.description) > 0
-    
-    def test_tool_has_args_schema(self):
-        """Test that the tool has an args schema for LangChain."""
-        assert get_weather_forecast.args_schema is not None
+    def test_reuses_forecast_within_max_age(self, mock_requests_get, _points_json):
+        """Test that a forecast is served from cache while Cache-Control allows it."""
+        mock_points_response = _resp(_points_json)
+        
+        forecast_data = {"properties": {"periods": [{"name": "Today", "temperature": 75}]}}
+        mock_forecast_response = _resp(forecast_data, status_code=200, headers={"Cache-Control": "public, max-age=600"})
+        
+        mock_requests_get.side_effect = [mock_points_response, mock_forecast_response]
+        
+        first = _wx({"latitude": 39.7456, "longitude": -97.0892})
+        second = _wx({"latitude": 39.7456, "longitude": -97.0892})
+        
+        assert first == second == forecast_data
+        assert mock_requests_get.call_count == 2
     
-    @pytest.mark.parametrize("lat,lon", [
-        (39.7456, -97.0892),  # Kansas
-        (34.0522, -118.2437),  # Los Angeles
-        (40.7128, -74.0060),   # New York
-        (25.7617, -80.1918),   # Miami
-        (47.6062, -122.3321),  # Seattle
-    ])
-    @patch('tools.weather_api.requests.get')
-    def test_various_us_locations(self, mock_get, lat, lon):
-        """Test get_weather_forecast with various US locations."""
-        mock_points_response = Mock()
-        mock_points_response.json.return_value = {
-            "properties": {
-                "forecast": f"https://api.weather.gov/gridpoints/TEST/1,2/forecast"
-            }
-        }
+    def test_revalidates_stale_forecast_with_etag(self, mock_requests_get, _points_json):
+        """Test that a stale forecast is revalidated with If-None-Match and reused on 304."""
+        mock_points_response = _resp(_points_json)
         
-        mock_forecast_response = Mock()
-        mock_forecast_response.json.return_value = {
-            "properties": {
-                "periods": [{"name": "Today", "temperature": 70}]
-            }
-        }
+        forecast_data = {"properties": {"periods": [{"name": "Today", "temperature": 75}]}}
+        mock_forecast_response = _resp(forecast_data, status_code=200, headers={"Cache-Control": "max-age=0", "ETag": '"abc"'})
         
-        mock_get.side_effect = [mock_points_response, mock_forecast_response]
+        mock_not_modified = Mock(status_code=304, headers={})
         
-        result = get_weather_forecast.invoke({
-            "latitude": lat,
-            "longitude": lon
-        })
+        mock_requests_get.side_effect = [mock_points_response, mock_forecast_response, mock_not_modified]
+        
+        _wx({"latitude": 39.7456, "longitude": -97.0892})
+        result = _wx({"latitude": 39.7456, "longitude": -97.0892})
+        
+        assert result == forecast_data
+        assert mock_requests_get.call_args_list[2][1]["headers"] == {"If-None-Match": '"abc"'}
+        mock_not_modified.json.assert_not_called()
+    
+    @pytest.mark.parametrize("payload", _US_LOCATION_PAYLOADS, ids=str)
+    def test_various_us_locations(self, mock_requests_get, _us_location_responses, payload):
+        """Test get_weather_forecast with various US locations."""
+        mock_requests_get.side_effect = iter(_us_location_responses)
+        
+        result = _wx(payload)
         
         assert result is not None
         assert "properties" in result
 
+
+class TestAgetWeatherForecast:
+    """Test suite for the async aget_weather_forecast function."""
+    
+    @pytest.fixture
+    def nws_requests(self, monkeypatch):
+        """Route the shared async client through a mock transport and record requests."""
+        seen = []
+        forecast_url = "https://api.weather.gov/gridpoints/TOP/31,80/forecast"
+        
+        def handler(request):
+            seen.append(str(request.url))
+            if request.url.path.startswith("/points/"):
+                return httpx.Response(200, json={"properties": {"forecast": forecast_url}})
+            return httpx.Response(200, json={"properties": {"periods": [{"name": "Today"}]}})
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(weather_api, "_get_async_client", lambda: client)
+        return seen
+    
+    def test_returns_forecast(self, nws_requests):
+        """Test that aget_weather_forecast follows the points URL to the forecast."""
+        result = asyncio.run(aget_weather_forecast(39.7456, -97.0892))
+        
+        assert result == {"properties": {"periods": [{"name": "Today"}]}}
+        assert nws_requests == [
+            f"{NWS_BASE_URL}/points/39.7456,-97.0892",
+            "https://api.weather.gov/gridpoints/TOP/31,80/forecast",
+        ]
+    
+    def test_returns_weather_error_for_forecast_server_error(self, monkeypatch):
+        """Test that an NWS error document from the forecast endpoint becomes a WeatherError."""
+        def handler(request):
+            if request.url.path.startswith("/points/"):
+                return httpx.Response(200, json={"properties": {"forecast": "https://api.weather.gov/gridpoints/TOP/31,80/forecast"}})
+            return httpx.Response(500, json={"title": "Unexpected Problem", "detail": "An unexpected problem has occurred."})
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(weather_api, "_get_async_client", lambda: client)
+        
+        result = asyncio.run(aget_weather_forecast(39.7456, -97.0892))
+        
+        assert result == WeatherError("An unexpected problem has occurred.")
+    
+    def test_reuses_cached_forecast_url(self, nws_requests):
+        """Test that repeated calls skip the points API."""
+        asyncio.run(aget_weather_forecast(39.7456, -97.0892))
+        asyncio.run(aget_weather_forecast(39.7456, -97.0892))
+        
+        assert len(nws_requests) == 3
+        assert "/points/" not in nws_requests[2]
+    
+    def test_tool_invokes_async_path(self, nws_requests):
+        """Test that the LangChain tool uses the async implementation under ainvoke."""
+        result = asyncio.run(get_weather_forecast.ainvoke({
+            "latitude": 39.7456,
+            "longitude": -97.0892
+        }))
+        
+        assert result == {"properties": {"periods": [{"name": "Today"}]}}
+        assert len(nws_requests) == 2